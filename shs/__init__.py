@@ -23,4 +23,7 @@ just a mathematically background can follow the implementation and a person
 with just a development background can follow the publication. 
 """
 
-from fips_pub_180_4 import SHA
\ No newline at end of file
+from fips_pub_180_4 import SHA
+from files import hash_file, hash_files
+from shared import hash_payloads
+from cache import DigestCache
@@ -0,0 +1,136 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# ============================================================================
+# Copyright (c) Martin P. Hellwig <martin.hellwig@gmail.com> 14 Mar 2013
+# All rights reserved.
+# ============================================================================
+#
+# Batch hashing of many (short) messages at once, with one of two engines.
+# Both group the messages by the number of blocks they have after padding and
+# hash each group together, with the round functions of the fast engine.
+#
+# The 'numpy' engine makes every message a lane in a numpy array, unsigned
+# numpy integers wrap around on overflow, so the masking in the fast engine is
+# merely a no-op here. Numpy is an optional dependency, it is only needed when
+# this engine is actually used.
+#
+# The 'swar' engine packs the lanes into python integers, see _swar, and has
+# no dependencies.
+""" """
+import binascii
+import struct
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+from fips_pub_180_4._functions import group, FORMAT_WORDS
+from fips_pub_180_4 import _fast
+from fips_pub_180_4 import _swar
+
+
+def _numpy_hash_values(messages, algorithm):
+    # Returns the hash values of messages, in the same order.
+    if numpy is None:
+        raise(ImportError("Batch hashing requires numpy, which is missing."))
+
+    if algorithm.SIZE_WORD == 32:
+        dtype = numpy.dtype('uint32')
+    else:
+        dtype = numpy.dtype('uint64')
+    big_endian = dtype.newbyteorder('>')
+
+    hash_values = [None] * len(messages)
+    groups = group(messages, algorithm.SIZE_BLOCK)
+    for blocks, members in groups.items():
+        lanes = len(members)
+        data = ''.join(padded for _, padded in members)
+        # 5.2 Parsing the Padded Message, a row of words per message, which is
+        # transposed so that every word is an array over all lanes.
+        words = numpy.frombuffer(data, dtype=big_endian)
+        words = words.reshape(lanes, blocks * 16).astype(dtype)
+        words = numpy.ascontiguousarray(words.T)
+
+        hash_value = tuple(numpy.full(lanes, word, dtype=dtype)
+                           for word in algorithm.initial())
+        for block in range(blocks):
+            block_words = words[block * 16:(block + 1) * 16]
+            hash_value = algorithm.compress(hash_value, block_words)
+
+        # A row of words per message.
+        result = numpy.array(hash_value, dtype=dtype).T
+        for (index, _), row in zip(members, result):
+            hash_values[index] = [int(word) for word in row]
+
+    return(hash_values)
+
+
+def _hexdigests(messages, digest_size, engine):
+    # Returns the hex digests of messages, in the same order.
+    algorithm = _fast.DIGESTS[digest_size]
+    if engine == 'numpy':
+        hash_values = _numpy_hash_values(messages, algorithm)
+    elif engine == 'swar':
+        hash_values = _swar.computation(messages, digest_size)
+    else:
+        text = "Engine '%s' not allowed must be in: %s"
+        raise(ValueError(text % (engine, ['numpy', 'swar'])))
+
+    tmp = list()
+    word_format = FORMAT_WORDS[algorithm.SIZE_WORD]
+    for hash_value in hash_values:
+        digest = struct.pack(word_format % len(hash_value), *hash_value)
+        tmp.append(binascii.hexlify(digest))
+    return(tmp)
+
+
+def sha1_many(messages, engine='numpy'):
+    """Return the SHA-1 hex digests of a list of bytestrings, in the same
+    order, identical to SHA(160).hexdigest() of each message. The engine is
+    either 'numpy' or 'swar'."""
+    return(_hexdigests(messages, 160, engine))
+
+
+def sha256_many(messages, engine='numpy'):
+    """Return the SHA-256 hex digests of a list of bytestrings, in the same
+    order, identical to SHA(256).hexdigest() of each message. The engine is
+    either 'numpy' or 'swar'."""
+    return(_hexdigests(messages, 256, engine))
+
+
+def sha512_many(messages, engine='numpy'):
+    """Return the SHA-512 hex digests of a list of bytestrings, in the same
+    order, identical to SHA(512).hexdigest() of each message. The engine is
+    either 'numpy' or 'swar'."""
+    return(_hexdigests(messages, 512, engine))
+
+
+def main():
+    # Benchmark, messages (lanes) per second of the swar engine against
+    # hashing every message on its own with the fast engine.
+    import time
+    from fips_pub_180_4 import SHA
+
+    messages = ['message %s' % index for index in range(2048)]
+    print('# Hashing %s short messages, messages per second' % len(messages))
+    print('#' * 79)
+    for digest_size in [160, 256]:
+        print('# - Sha %s' % digest_size)
+        start = time.time()
+        for message in messages:
+            sha = SHA(digest_size, engine='fast')
+            sha.update(message)
+            sha.digest()
+        single = len(messages) / (time.time() - start)
+        print('single    : %10.1f' % single)
+
+        for lanes in [16, 64, 256, 1024]:
+            start = time.time()
+            _swar.computation(messages, digest_size, lanes)
+            packed = len(messages) / (time.time() - start)
+            print('swar %5s: %10.1f (%.1fx)' % (lanes, packed, packed / single))
+        print('#' * 79)
+
+if __name__ == '__main__':
+    main()
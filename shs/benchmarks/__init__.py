@@ -0,0 +1,17 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# ============================================================================
+# Copyright (c) Martin P. Hellwig <martin.hellwig@gmail.com> 14 Mar 2013
+# All rights reserved.
+# ============================================================================
+#
+# Benchmarks, each module is run from the directory containing shs with:
+#   python -m shs.benchmarks.<module> [--output results.json]
+#
+# primitives: the Bits operations and the round functions on their own.
+# throughput: bytes and digests per second per digest size, engine and input
+#             size, with --compare to fail on a regression against a baseline.
+# memory: peak memory per stage of the hash computation and input size.
+# imports: time to import shs and to create the first SHA, per engine.
+""" """
@@ -0,0 +1,81 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# ============================================================================
+# Copyright (c) Martin P. Hellwig <martin.hellwig@gmail.com> 14 Mar 2013
+# All rights reserved.
+# ============================================================================
+#
+# Import time benchmark, the startup cost of a short lived process which
+# hashes with a single algorithm. Every case is timed in a fresh python
+# process, so that nothing is imported yet, as the best of REPEAT runs:
+#   import      - import shs
+#   <engine>    - import shs and create the first SHA(256) of the engine
+#   all         - import shs and create a SHA of every digest size and engine
+""" """
+import argparse
+import json
+import platform
+import subprocess
+import sys
+
+REPEAT = 5
+
+# The statement of every case, timed after python itself has started.
+CASES = [('import', 'import shs'),
+         ('fast', "import shs; shs.SHA(256, 'fast')"),
+         ('generated', "import shs; shs.SHA(256, 'generated')"),
+         ('reference', "import shs; shs.SHA(256, 'reference')"),
+         ('all', "import shs\n"
+                 "for engine in ['reference', 'fast', 'generated']:\n"
+                 "    for size in [160, 224, 256, 384, 512, '512:224', "
+                 "'512:256']:\n"
+                 "        shs.SHA(size, engine)")]
+
+TIMER = """import timeit
+start = timeit.default_timer()
+%s
+print(timeit.default_timer() - start)
+"""
+
+def measure(statement, repeat=REPEAT):
+    "Return the best time in seconds of statement in a fresh process."
+    times = list()
+    for _ in range(repeat):
+        output = subprocess.check_output([sys.executable, '-c',
+                                          TIMER % statement])
+        times.append(float(output))
+    return(min(times))
+
+
+def run(repeat=REPEAT):
+    "Run all cases and return the results as a list of dictionaries."
+    results = list()
+    for name, statement in CASES:
+        results.append({'name':name,
+                        'repeat':repeat,
+                        'seconds':measure(statement, repeat)})
+    return(results)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--output', help='write the results as JSON to file')
+    parser.add_argument('--repeat', type=int, default=REPEAT)
+    arguments = parser.parse_args()
+
+    results = run(arguments.repeat)
+    print('# %-30s %18s' % ('Case', 'Milliseconds'))
+    print('#' * 79)
+    for result in results:
+        print('  %-30s %18.2f' % (result['name'], result['seconds'] * 1e3))
+
+    if arguments.output:
+        document = {'python':platform.python_version(),
+                    'implementation':platform.python_implementation(),
+                    'results':results}
+        with open(arguments.output, 'w') as handle:
+            json.dump(document, handle, indent=2, sort_keys=True)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,220 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# ============================================================================
+# Copyright (c) Martin P. Hellwig <martin.hellwig@gmail.com> 14 Mar 2013
+# All rights reserved.
+# ============================================================================
+#
+# Peak memory profile of the hash computation, per stage and input size, to
+# show how the memory use scales with the length of the message.
+# The stages are:
+#   padding     - 5.1 padding the final block(s) of the message
+#   parsing     - 5.2 parsing every block of the message into words
+#   schedule    - Step 1, the message schedule of every block
+#   rounds      - Steps 2 and 3, the rounds of every block, each on the message
+#                 schedule made for it first
+#   digest      - SHA.update with the whole message followed by SHA.digest
+# The reference engine computes the message schedule from word 16 on when the
+# rounds ask for it, so that part of its schedule is measured with the rounds.
+#
+# Python 2 has no tracemalloc, so every stage is run in a forked child process
+# and the peak is the growth of its maximum resident set size. The growth of a
+# function doing nothing, measured the same way in the same child, is
+# subtracted and the least of a few children is taken, as the resident set
+# also grows by whatever the interpreter happens to touch.
+# The kernel only updates the maximum resident set size in steps, on Linux of
+# 64 pages or more, which is measured at the start. Any allocation can happen
+# to cross a step, so a peak of less than two steps is below the resolution,
+# it only says that the stage used less than that, and is shown as such.
+""" """
+import argparse
+import json
+import multiprocessing
+import platform
+import resource
+import sys
+
+from shs.fips_pub_180_4 import SHA, _fast, _sha_2, _sha_256, _sha_512
+from shs.fips_pub_180_4._functions import pad, parse
+from shs.benchmarks.throughput import message
+
+ALGORITHMS = {'reference':{256:_sha_256, 512:_sha_512},
+              'fast':{256:_fast.DIGESTS[256], 512:_fast.DIGESTS[512]}}
+# The reference engine is too slow for large inputs.
+INPUT_SIZES = {'reference':[0, 1024, 16 * 1024],
+               'fast':[0, 1024, 64 * 1024, 1024 * 1024, 8 * 1024 * 1024]}
+REPEATS = 3 # child processes per measurement of the resident set size
+PAGE = resource.getpagesize() # bytes
+
+def stages(engine, digest_size, data):
+    "Return a list of (name, function) of the stages for data."
+    algorithm = ALGORITHMS[engine][digest_size]
+    size_block = algorithm.SIZE_BLOCK
+    size_word = algorithm.SIZE_WORD
+    if engine == 'reference':
+        schedule = algorithm.schedule
+        rounds = algorithm.rounds
+    else:
+        family = _sha_2.FAMILIES[size_word]
+        schedule = lambda words: family.schedule(words, family.mask)
+        rounds = lambda hash_value, message_schedule: family.rounds(
+                     hash_value, message_schedule, family.mask,
+                     family.constants)
+
+    def padding():
+        pad(data, size_block)
+
+    def parsing():
+        for words in parse(data, size_block, size_word):
+            pass
+
+    def scheduling():
+        for words in parse(data, size_block, size_word):
+            schedule(words)
+
+    def rounding():
+        hash_value = algorithm.initial()
+        for words in parse(data, size_block, size_word):
+            rounds(hash_value, schedule(words))
+
+    def digest():
+        sha = SHA(digest_size, engine)
+        sha.update(data)
+        sha.digest()
+
+    return([('padding', padding), ('parsing', parsing),
+            ('schedule', scheduling), ('rounds', rounding),
+            ('digest', digest)])
+
+
+def _maximum_resident():
+    # The maximum resident set size in bytes, Linux reports it in kilobytes.
+    maximum = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    if sys.platform != 'darwin':
+        maximum *= 1024
+    return(maximum)
+
+
+def _nothing():
+    # The baseline of the resident set size measurement.
+    pass
+
+
+def _growth(function):
+    # Growth in bytes of the maximum resident set size by calling function.
+    before = _maximum_resident()
+    function()
+    return(_maximum_resident() - before)
+
+
+def _step():
+    # Touch a page at a time until the maximum resident set size grows,
+    # returns by how much it did.
+    pages = list()
+    before = _maximum_resident()
+    while _maximum_resident() == before:
+        pages.append(bytearray(PAGE))
+    return(_maximum_resident() - before)
+
+
+def _call(function, queue):
+    # Runs function in the child process and reports its result.
+    queue.put(function())
+
+
+def _in_child(function):
+    # The result of function, called in a forked child process.
+    queue = multiprocessing.Queue()
+    process = multiprocessing.Process(target=_call, args=(function, queue))
+    process.start()
+    result = queue.get()
+    process.join()
+    return(result)
+
+
+def resolution():
+    """Return the step in bytes by which the maximum resident set size grows,
+    the largest of REPEATS child processes."""
+    return(max([_in_child(_step) for _ in range(REPEATS)]))
+
+
+def peak(function):
+    """Return the peak memory in bytes used by calling function, the least
+    growth of the maximum resident set size of REPEATS child processes, less
+    that of doing nothing."""
+    def growth():
+        baseline = _growth(_nothing)
+        return(max(0, _growth(function) - baseline))
+    return(min([_in_child(growth) for _ in range(REPEATS)]))
+
+
+def run(engines, digest_sizes, input_sizes=None, step=None):
+    """Run the profile and return the results as a list of dictionaries.
+    A peak of less than two steps of step bytes, by default the resolution,
+    is marked as below_resolution."""
+    if step is None:
+        step = resolution()
+    results = list()
+    for engine in engines:
+        sizes = input_sizes or INPUT_SIZES[engine]
+        for digest_size in digest_sizes:
+            for size in sizes:
+                data = message(size)
+                for name, function in stages(engine, digest_size, data):
+                    peak_bytes = peak(function)
+                    results.append({'engine':engine,
+                                    'digest_size':str(digest_size),
+                                    'input_size':size,
+                                    'stage':name,
+                                    'peak_bytes':peak_bytes,
+                                    'below_resolution':
+                                        peak_bytes < 2 * step})
+    return(results)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--engine', action='append', dest='engines',
+                        help="'reference' or 'fast', can be repeated "
+                             "(default: both)")
+    parser.add_argument('--digest', action='append', dest='digest_sizes',
+                        type=int, help='256 or 512, can be repeated '
+                                       '(default: both)')
+    parser.add_argument('--size', action='append', dest='sizes', type=int,
+                        help='input size in bytes, can be repeated '
+                             '(default: per engine)')
+    parser.add_argument('--output', help='write the results as JSON to file')
+    arguments = parser.parse_args()
+    engines = arguments.engines or ['fast', 'reference']
+    digest_sizes = arguments.digest_sizes or [256, 512]
+
+    step = resolution()
+    results = run(engines, digest_sizes, arguments.sizes, step)
+    print('# Peak memory in bytes, growth of ru_maxrss in steps of %s bytes, '
+          'the' % step)
+    print('# least of %s children less the growth of doing nothing' %
+          REPEATS)
+    print('# %-10s %-7s %10s %-12s %16s' % ('Engine', 'Digest', 'Bytes',
+                                            'Stage', 'Peak'))
+    print('#' * 79)
+    for result in results:
+        if result['below_resolution']:
+            peak_bytes = 'below %s' % (2 * step)
+        else:
+            peak_bytes = result['peak_bytes']
+        print('  %-10s %-7s %10s %-12s %16s' % (
+              result['engine'], result['digest_size'], result['input_size'],
+              result['stage'], peak_bytes))
+
+    if arguments.output:
+        document = {'python':platform.python_version(),
+                    'implementation':platform.python_implementation(),
+                    'method':'ru_maxrss',
+                    'resolution_bytes':step,
+                    'results':results}
+        with open(arguments.output, 'w') as handle:
+            json.dump(document, handle, indent=2, sort_keys=True)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,116 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# ============================================================================
+# Copyright (c) Martin P. Hellwig <martin.hellwig@gmail.com> 14 Mar 2013
+# All rights reserved.
+# ============================================================================
+#
+# Micro benchmark of the building blocks of the hash computation, for 32 bits
+# words (SHA-256) and 64 bits words (SHA-512): the Bits operations, the
+# rotations and shifts, every sigma function, the message schedule expansion
+# and one complete compression of a block. The latter two are also timed for
+# the fast engine, as a point of comparison.
+#
+# Every case is timed as the best of REPEAT runs of a number of calls, the
+# results are printed and optionally written as JSON.
+""" """
+import argparse
+import json
+import platform
+import timeit
+
+from shs.fips_pub_180_4._binary import Bits
+from shs.fips_pub_180_4 import _sha_256, _sha_512, _sha_2
+
+REPEAT = 5
+
+# Arbitrary but fixed operands, so that runs are comparable.
+OPERANDS = {32:(0x6a09e667, 0xbb67ae85),
+            64:(0x6a09e667f3bcc908, 0xbb67ae8584caa73b)}
+
+def _schedule(module, size_word, words):
+    # The message schedule of the reference modules, 6.2.2 and 6.4.2 Step 1,
+    # all of its words asked for as the rounds within compress do.
+    rounds = {32:64, 64:80}[size_word]
+    message_schedule = module.schedule(words)
+    for index in range(rounds):
+        message_schedule[index]
+
+
+def cases(size_word):
+    "Return a list of (name, callable, number of calls) for a word size."
+    module = {32:_sha_256, 64:_sha_512}[size_word]
+    suffix = {32:'256', 64:'512'}[size_word]
+    family = _sha_2.FAMILIES[size_word]
+    one, two = OPERANDS[size_word]
+    x = Bits(one, size_word)
+    y = Bits(two, size_word)
+    block = Bits(''.join(['01'] * (8 * size_word)))
+    words = tuple([one, two] * 8)
+    hash_value = module.initial()
+
+    tmp = [('Bits.__and__', lambda: x & y, 1000),
+           ('Bits.__xor__', lambda: x ^ y, 1000),
+           ('Bits.__or__', lambda: x | y, 1000),
+           ('Bits.__invert__', lambda: ~x, 1000),
+           ('Bits.__add__', lambda: x + y, 1000),
+           ('Bits.__int__', lambda: int(x), 1000),
+           ('Bits.split', lambda: block.split(size_word), 100),
+           ('rotate_right', lambda: module.rotate_right(x, 7), 1000),
+           ('shift_right', lambda: module.shift_right(x, 7), 1000)]
+    for name in ['sigma_upper_%s_0', 'sigma_upper_%s_1',
+                 'sigma_lower_%s_0', 'sigma_lower_%s_1']:
+        name = name % suffix
+        function = getattr(module, name)
+        tmp.append((name, lambda function=function: function(x), 100))
+
+    tmp.append(('message_schedule',
+                lambda: _schedule(module, size_word, words), 5))
+    tmp.append(('compress', lambda: module.compress(hash_value, words), 2))
+    fast_value = tuple(int(word) for word in hash_value)
+    tmp.append(('fast.message_schedule',
+                lambda: family.schedule(words, family.mask), 500))
+    tmp.append(('fast.compress',
+                lambda: family.compress(fast_value, words), 200))
+    return(tmp)
+
+
+def run(repeat=REPEAT):
+    "Run all cases and return the results as a list of dictionaries."
+    results = list()
+    for size_word in [32, 64]:
+        for name, function, number in cases(size_word):
+            timer = timeit.Timer(function)
+            best = min(timer.repeat(repeat, number))
+            results.append({'name':name,
+                            'word_size':size_word,
+                            'number':number,
+                            'repeat':repeat,
+                            'seconds':best,
+                            'microseconds_per_call':best / number * 1e6})
+    return(results)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--output', help='write the results as JSON to file')
+    parser.add_argument('--repeat', type=int, default=REPEAT)
+    arguments = parser.parse_args()
+
+    results = run(arguments.repeat)
+    print('# %-30s %5s %18s' % ('Case', 'Word', 'Microseconds/call'))
+    print('#' * 79)
+    for result in results:
+        print('  %-30s %5s %18.2f' % (result['name'], result['word_size'],
+                                      result['microseconds_per_call']))
+
+    if arguments.output:
+        document = {'python':platform.python_version(),
+                    'implementation':platform.python_implementation(),
+                    'results':results}
+        with open(arguments.output, 'w') as handle:
+            json.dump(document, handle, indent=2, sort_keys=True)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,181 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# ============================================================================
+# Copyright (c) Martin P. Hellwig <martin.hellwig@gmail.com> 14 Mar 2013
+# All rights reserved.
+# ============================================================================
+#
+# End to end throughput benchmark, bytes and digests per second of SHA for
+# every digest size and engine over a range of input sizes. Where the python
+# built-in hashlib has the algorithm it is measured as well, as the point of
+# reference.
+#
+# The input is a fixed byte pattern and every measurement is the best of
+# REPEAT runs, each run being enough digests to take at least MINIMUM_TIME
+# seconds, so that the numbers are reproducible on the same machine.
+#
+# The results can be written as JSON with --output and a later run can be
+# compared against such a baseline with --compare, the run then fails (exit
+# status 1) if the throughput of any measurement dropped by more than
+# --tolerance percent.
+""" """
+import argparse
+import hashlib
+import json
+import platform
+import sys
+import time
+
+from shs.fips_pub_180_4 import SHA
+
+REPEAT = 3
+MINIMUM_TIME = 0.2 # seconds
+TOLERANCE = 10.0 # percent
+
+DIGEST_SIZES = [160, 224, 256, 384, 512, '512:224', '512:256']
+HASHLIB_NAMES = {160:'sha1', 224:'sha224', 256:'sha256', 384:'sha384',
+                 512:'sha512', '512:224':'sha512_224', '512:256':'sha512_256'}
+# The reference engine is too slow for large inputs.
+INPUT_SIZES = {'reference':[0, 64, 1024],
+               'fast':[0, 64, 1024, 64 * 1024, 1024 * 1024, 4 * 1024 * 1024]}
+
+def message(size):
+    "Return the fixed input of size bytes."
+    pattern = ''.join([chr(index) for index in range(251)])
+    return((pattern * (size // len(pattern) + 1))[:size])
+
+
+def _hasher(engine, digest_size):
+    # Return a function which hashes a message, or None if not available.
+    if engine == 'hashlib':
+        name = HASHLIB_NAMES[digest_size]
+        try:
+            hashlib.new(name)
+        except ValueError:
+            return(None)
+        return(lambda data: hashlib.new(name, data).digest())
+
+    def function(data):
+        sha = SHA(digest_size, engine)
+        sha.update(data)
+        return(sha.digest())
+    return(function)
+
+
+def measure(function, data, repeat=REPEAT):
+    "Return the best time of a single call of function on data."
+    # Find the number of calls which takes at least MINIMUM_TIME.
+    number = 1
+    while True:
+        start = time.time()
+        for _ in range(number):
+            function(data)
+        elapsed = time.time() - start
+        if elapsed >= MINIMUM_TIME:
+            break
+        number *= 2
+
+    best = elapsed
+    for _ in range(repeat - 1):
+        start = time.time()
+        for _ in range(number):
+            function(data)
+        best = min(best, time.time() - start)
+    return(best / number)
+
+
+def run(engines, input_sizes=None, repeat=REPEAT):
+    "Run the benchmark and return the results as a list of dictionaries."
+    results = list()
+    for engine in engines:
+        if input_sizes is None:
+            sizes = INPUT_SIZES.get(engine, INPUT_SIZES['fast'])
+        else:
+            sizes = input_sizes
+        for digest_size in DIGEST_SIZES:
+            function = _hasher(engine, digest_size)
+            if function is None:
+                continue
+            for size in sizes:
+                seconds = measure(function, message(size), repeat)
+                results.append({'engine':engine,
+                                'digest_size':str(digest_size),
+                                'input_size':size,
+                                'seconds':seconds,
+                                'digests_per_second':1.0 / seconds,
+                                'bytes_per_second':size / seconds})
+    return(results)
+
+
+def compare(results, baseline, tolerance=TOLERANCE):
+    """Compare results against the baseline results, return a list of the
+    text lines describing the measurements which dropped more than tolerance
+    percent. Hashlib is not compared, it is not what is being developed."""
+    def key(result):
+        return(result['engine'], result['digest_size'], result['input_size'])
+
+    previous = dict([(key(result), result) for result in baseline])
+    tmp = list()
+    for result in results:
+        if result['engine'] == 'hashlib' or key(result) not in previous:
+            continue
+        before = previous[key(result)]['digests_per_second']
+        after = result['digests_per_second']
+        drop = (before - after) / before * 100
+        if drop > tolerance:
+            text = '%s %s %s bytes: %.1f%% slower (%.1f -> %.1f digests/s)'
+            tmp.append(text % (key(result) + (drop, before, after)))
+    return(tmp)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--engine', action='append', dest='engines',
+                        help="engine to measure, 'reference', 'fast', "
+                             "'generated' or 'hashlib', can be repeated "
+                             "(default: all)")
+    parser.add_argument('--size', action='append', dest='sizes', type=int,
+                        help='input size in bytes, can be repeated '
+                             '(default: per engine)')
+    parser.add_argument('--repeat', type=int, default=REPEAT)
+    parser.add_argument('--output', help='write the results as JSON to file')
+    parser.add_argument('--compare', help='JSON file of a previous run')
+    parser.add_argument('--tolerance', type=float, default=TOLERANCE,
+                        help='allowed drop in percent (default: %(default)s)')
+    arguments = parser.parse_args()
+    engines = arguments.engines or ['hashlib', 'generated', 'fast',
+                                     'reference']
+
+    results = run(engines, arguments.sizes, arguments.repeat)
+    print('# %-10s %-8s %10s %16s %16s' % ('Engine', 'Digest', 'Bytes',
+                                           'Bytes/s', 'Digests/s'))
+    print('#' * 79)
+    for result in results:
+        print('  %-10s %-8s %10s %16.1f %16.1f' % (
+              result['engine'], result['digest_size'], result['input_size'],
+              result['bytes_per_second'], result['digests_per_second']))
+
+    document = {'python':platform.python_version(),
+                'implementation':platform.python_implementation(),
+                'machine':platform.machine(),
+                'repeat':arguments.repeat,
+                'results':results}
+    if arguments.output:
+        with open(arguments.output, 'w') as handle:
+            json.dump(document, handle, indent=2, sort_keys=True)
+
+    if arguments.compare:
+        with open(arguments.compare) as handle:
+            baseline = json.load(handle)
+        regressions = compare(results, baseline['results'],
+                              arguments.tolerance)
+        if len(regressions) > 0:
+            print('# Regressions against %s' % arguments.compare)
+            for line in regressions:
+                print(line)
+            sys.exit(1)
+        print('# No regressions against %s' % arguments.compare)
+
+if __name__ == '__main__':
+    main()
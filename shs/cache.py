@@ -0,0 +1,145 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# ============================================================================
+# Copyright (c) Martin P. Hellwig <martin.hellwig@gmail.com> 14 Mar 2013
+# All rights reserved.
+# ============================================================================
+#
+# A cache of digests, for when the same small messages are hashed over and
+# over again. It is opt-in, SHA itself does not use it:
+#   cache = DigestCache()
+#   cache.hexdigest(message, 256)
+#
+# The digests are kept by (digest_size, message) and the least recently used
+# are dropped once there are more than entries of them, or once the messages
+# kept are together more than size bytes. Messages of more than threshold
+# bytes are hashed but never kept. A lock makes it safe to share a cache
+# between threads, the hashing itself is done outside of the lock.
+#
+# The order of use is kept by LRU, which the midstates of hmac use as well.
+""" """
+import binascii
+import collections
+import threading
+
+from fips_pub_180_4 import SHA
+from fips_pub_180_4._functions import view
+
+ENTRIES = 1024
+SIZE = 1024 * 1024 # bytes
+THRESHOLD = 4 * 1024 # bytes
+
+class LRU(object):
+    """Mapping in the order of use, the least recently used first. It has no
+    lock of its own, its users hold theirs around it."""
+    def __init__(self):
+        self._items = collections.OrderedDict() # oldest used first
+
+    def __len__(self):
+        return(len(self._items))
+
+    def __contains__(self, key):
+        return(key in self._items)
+
+    def get(self, key, default=None):
+        "Return the value of key, or default if not there, as used now."
+        if key not in self._items:
+            return(default)
+        # Move it to the end, as the most recently used.
+        value = self._items.pop(key)
+        self._items[key] = value
+        return(value)
+
+    def put(self, key, value):
+        "Set the value of key, as used now."
+        self._items.pop(key, None)
+        self._items[key] = value
+
+    def pop(self):
+        "Remove and return the (key, value) least recently used."
+        return(self._items.popitem(last=False))
+
+    def clear(self):
+        self._items.clear()
+
+
+class DigestCache(object):
+    """Cache of the digests of messages, at most entries of them and at most
+    size bytes of messages together, messages of more than threshold bytes
+    are not cached. The engine is as for SHA.
+    The attributes hits, misses and skips count the lookups found, not found
+    and too large to cache."""
+    def __init__(self, entries=ENTRIES, size=SIZE, threshold=THRESHOLD,
+                 engine='fast'):
+        # Fail here on an invalid engine, not on the first digest.
+        SHA(engine=engine)
+        self.entries = entries
+        self.size = size
+        self.threshold = threshold
+        self.engine = engine
+        self.hits = 0
+        self.misses = 0
+        self.skips = 0
+        self._digests = LRU()
+        self._size = 0 # bytes of the messages kept
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return(len(self._digests))
+
+    def _hash(self, message, digest_size):
+        sha = SHA(digest_size, self.engine)
+        sha.update(message)
+        return(sha.digest())
+
+    def digest(self, message, digest_size=256):
+        "Return the digest of message, as SHA(digest_size).digest() would."
+        message = view(message)
+        if len(message) > self.threshold:
+            with self._lock:
+                self.skips += 1
+            return(self._hash(message, digest_size))
+
+        key = (digest_size, message.tobytes())
+        with self._lock:
+            digest = self._digests.get(key)
+            if digest is not None:
+                self.hits += 1
+                return(digest)
+            self.misses += 1
+
+        digest = self._hash(message, digest_size)
+        with self._lock:
+            if key not in self._digests:
+                self._digests.put(key, digest)
+                self._size += len(key[1])
+                self._evict()
+        return(digest)
+
+    def hexdigest(self, message, digest_size=256):
+        "Return the hex digest of message, as SHA.hexdigest() would."
+        return(binascii.hexlify(self.digest(message, digest_size)))
+
+    def _evict(self):
+        # Drop the least recently used digests until within the bounds, the
+        # lock must be held.
+        while (len(self._digests) > self.entries or
+               (self._size > self.size and len(self._digests) > 0)):
+            key, _ = self._digests.pop()
+            self._size -= len(key[1])
+
+    def clear(self):
+        "Drop all the digests, the statistics are kept."
+        with self._lock:
+            self._digests.clear()
+            self._size = 0
+
+    def statistics(self):
+        "Return a dictionary of the statistics and the current use."
+        with self._lock:
+            return({'hits':self.hits,
+                    'misses':self.misses,
+                    'skips':self.skips,
+                    'entries':len(self._digests),
+                    'bytes':self._size})
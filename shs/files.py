@@ -0,0 +1,86 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# ============================================================================
+# Copyright (c) Martin P. Hellwig <martin.hellwig@gmail.com> 14 Mar 2013
+# All rights reserved.
+# ============================================================================
+#
+# Hashing of files. Hashing is done in pure python and thus bound by the CPU
+# and the GIL, so several files are hashed in parallel by worker processes
+# instead of threads.
+#
+# A file is memory mapped and hashed in place, so no part of it is copied
+# except for the final incomplete block. Files which can not be mapped, like
+# pipes and empty files, are read in chunks of CHUNK_SIZE bytes into the same
+# bytearray, so never more than one chunk of a file is held.
+""" """
+import io
+import mmap
+from fips_pub_180_4 import SHA
+
+CHUNK_SIZE = 64 * 1024 # A multiple of both block sizes (64 and 128 bytes)
+
+def _update_mapped(sha, handle):
+    # Update sha with the file as a memory map, returns False if the file can
+    # not be mapped.
+    try:
+        mapped = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+    except (EnvironmentError, ValueError):
+        return(False)
+    try:
+        sha.update(mapped)
+    finally:
+        mapped.close()
+    return(True)
+
+
+def _update_chunked(sha, handle):
+    # Update sha with the file read in chunks, into the same bytearray.
+    chunk = bytearray(CHUNK_SIZE)
+    view = memoryview(chunk)
+    while True:
+        count = handle.readinto(chunk)
+        if not count:
+            break
+        sha.update(view[:count])
+
+
+def hash_file(path, digest_size=256, engine='fast'):
+    """Return the hex digest of the content of the file at path. Digest_size
+    and engine are as for SHA."""
+    sha = SHA(digest_size, engine)
+    with io.open(path, 'rb') as handle:
+        if not _update_mapped(sha, handle):
+            _update_chunked(sha, handle)
+    return(sha.hexdigest())
+
+
+def _hash_file(arguments):
+    # Worker function, returns the path with the hex digest of its content.
+    path, digest_size, engine = arguments
+    return(path, hash_file(path, digest_size, engine))
+
+
+def _results(arguments, workers):
+    # Generator of the worker results, the pool lives as long as it does.
+    # Imported here, loading multiprocessing takes longer than all of shs.
+    import multiprocessing
+    pool = multiprocessing.Pool(workers)
+    try:
+        for result in pool.imap_unordered(_hash_file, arguments):
+            yield(result)
+        pool.close()
+        pool.join()
+    finally:
+        pool.terminate()
+
+
+def hash_files(paths, digest_size=256, workers=None, engine='fast'):
+    """Hash the files in paths with a pool of worker processes, by default as
+    many as there are CPU's. Returns an iterator of (path, hexdigest) in the
+    order the files are finished. Digest_size and engine are as for SHA."""
+    # Fail here on an invalid digest size or engine, not in the workers.
+    SHA(digest_size, engine)
+    arguments = [(path, digest_size, engine) for path in paths]
+    return(_results(arguments, workers))
@@ -15,6 +15,10 @@
 # _sha1, _sha224, _sha256, _sha384, _sha512, _sha512_224 and _sha512_256.
 # The modules have a lot of code in common which on purpose have not been
 # factored out to keep the FIPS specification more in line with the code.
+# The fast engine (_fast) does not need that, its SHA-2 variants all share
+# the hash computation of their word size, built from the descriptors in
+# _sha_2. The generated engine (_generated) writes those out as straight line
+# source for every family.
 #
 # A Bits class has been implemented in the module _binary, which emulates
 # an integer binary type using text as a back-end, this is done so we remove 
@@ -27,54 +31,142 @@
 # Where appropriate I have commented the relevant section of the standard in 
 # the code.
 """ """
-from _sha_1 import computation as _sha_1
-from _sha_256 import computation as _sha_256
-from _sha_224 import computation as _sha_224
-from _sha_512 import computation as _sha_512
-from _sha_384 import computation as _sha_384
-from _sha_512_224 import computation as _sha_512_224
-from _sha_512_256 import computation as _sha_512_256
+import binascii
+import struct
+
+from _functions import pad, parse, view, FORMAT_WORDS
+
+# The modules of the algorithms, per engine. A module is only imported when
+# SHA first asks for one of its algorithms, so that hashing with only one
+# algorithm does not cost loading all of them.
+# The reference modules, per digest size, are the algorithms themselves, the
+# other engines have one module with the algorithms in DIGESTS.
+MODULES = {'reference':{160:'_sha_1',
+                        224:'_sha_224',
+                        256:'_sha_256',
+                        512:'_sha_512',
+                        384:'_sha_384',
+                        '512:224':'_sha_512_224',
+                        '512:256':'_sha_512_256'},
+           'fast':'_fast',
+           'generated':'_generated'}
+
+_ALGORITHMS = dict() # (engine, digest_size) to the algorithm, once loaded
+
+def algorithm(digest_size=512, engine='reference'):
+    """Return the algorithm of digest_size for engine, as used by SHA. Its
+    module is imported on first use."""
+    key = (engine, digest_size)
+    if key in _ALGORITHMS:
+        return(_ALGORITHMS[key])
+
+    if engine not in MODULES:
+        text = "Engine '%s' not allowed must be in: %s"
+        raise(ValueError(text % (engine, sorted(MODULES))))
+
+    if engine == 'reference':
+        # The same implicit relative import as 'import _sha_256' does.
+        found = __import__(MODULES[engine][digest_size], globals())
+    else:
+        found = __import__(MODULES[engine], globals()).DIGESTS[digest_size]
+    _ALGORITHMS[key] = found
+    return(found)
+
 
 class SHA(object):
     """Secure Hash Algorithm, digest_size must be a one of 160, 224, 256, 384, 
-    512, '512:224' or '512:256'."""
-    def __init__(self, digest_size=512):
+    512, '512:224' or '512:256'. The engine is either 'reference', which uses
+    the readable Bits implementation, 'fast' which uses integers or
+    'generated' which uses integers with every round written out."""
+    def __init__(self, digest_size=512, engine='reference'):
         # Fetch the appropriate algorithm.
-        digests = {160:_sha_1,
-                   224:_sha_224,
-                   256:_sha_256,
-                   512:_sha_512,
-                   384:_sha_384,
-                   '512:224':_sha_512_224,
-                   '512:256':_sha_512_256}
+        self._algorithm = algorithm(digest_size, engine)
+        # The message is hashed per block as soon as the block is complete,
+        # so only the running hash value and the incomplete tail are kept.
+        self._hash_value = self._algorithm.initial()
+        self._size_block = self._algorithm.SIZE_BLOCK // 8 # in bytes
+        self._tail = '' # This must be a bytestring
+        self._length = 0 # Length in bytes of all the message given so far
+        self._digest = None # The digest of the message so far, once asked
         
-        self._computation = digests[digest_size]    
-        self.content = '' # This must be a bytestring
+    def _compress(self, message):
+        # 5.2 Parsing the complete blocks of message into their words.
+        algorithm = self._algorithm
+        for words in parse(message, algorithm.SIZE_BLOCK, algorithm.SIZE_WORD):
+            self._hash_value = algorithm.compress(self._hash_value, words)
         
     def update(self, message):
-        self.content += message # updates a bytestring
-        # The built-in python implementation is optimised to intermediate
-        # hash the blocks; for readability purpose I have not done this.
+        # The message is any object with the buffer interface (see view), it
+        # is read in place. The tail is always copied so that it never refers
+        # to the memory of message.
+        message = view(message)
+        self._length += len(message)
+        self._digest = None
+        offset = 0
+        if len(self._tail) > 0:
+            # First complete the tail left over from the previous update.
+            offset = self._size_block - len(self._tail)
+            self._tail += message[:offset].tobytes()
+            if len(self._tail) < self._size_block:
+                return
+            self._compress(self._tail)
+
+        # The complete blocks are compressed directly from the message.
+        blocks = (len(message) - offset) // self._size_block
+        end = offset + blocks * self._size_block
+        self._compress(message[offset:end])
+        self._tail = message[end:].tobytes()
+        
+    def copy(self):
+        """Return a copy of this object, which can be updated independently.
+        The blocks compressed so far are not compressed again."""
+        other = self.__class__.__new__(self.__class__)
+        other._algorithm = self._algorithm
+        # The hash value is a tuple and the tail a bytestring, both are never
+        # modified in place, so they can be shared.
+        other._hash_value = self._hash_value
+        other._size_block = self._size_block
+        other._tail = self._tail
+        other._length = self._length
+        other._digest = self._digest
+        return(other)
+
+    def midstate(self):
+        """Return the intermediate hash value after the blocks given so far,
+        as words of the engine. The message given so far must be complete
+        blocks, as an incomplete block is not compressed until the end."""
+        if len(self._tail) > 0:
+            text = "Message length '%s' not allowed must be whole blocks of %s"
+            raise(ValueError(text % (self._length, self._size_block)))
+        return(self._hash_value)
+
+    def _computation(self):
+        # Pad and finish a copy of the running hash value, so that the object
+        # can still be updated afterwards.
+        algorithm = self._algorithm
+        hash_value = self._hash_value
+        length = self._length * 8
+        padded = pad(self._tail, algorithm.SIZE_BLOCK, length)
+        for words in parse(padded, algorithm.SIZE_BLOCK, algorithm.SIZE_WORD):
+            hash_value = algorithm.compress(hash_value, words)
+        
+        return(hash_value)
     
     def digest(self):
-        tmp = list()
-        return_value = self._computation(self.content)
-        for binary in return_value:
-            binary = binary._binary
-            while len(binary) > 0:
-                byte = int(binary[:8], 2)
-                binary = binary[8:]
-                character = chr(byte)
-                tmp.append(character)
+        # The final hash value is packed as integers, of which the left most
+        # SIZE_DIGEST bits are the digest (6.3 up to 6.7). The digest is kept
+        # until the next update, so asking again does not hash again.
+        if self._digest is None:
+            algorithm = self._algorithm
+            words = [int(word) for word in self._computation()]
+            word_format = FORMAT_WORDS[algorithm.SIZE_WORD] % len(words)
+            packed = struct.pack(word_format, *words)
+            self._digest = packed[:algorithm.SIZE_DIGEST // 8]
             
-        return(''.join(tmp))
+        return(self._digest)
             
     def hexdigest(self):
-        tmp = list()
-        for byte in self.digest():
-            hexed = hex(ord(byte))[2:].zfill(2)
-            tmp.append(hexed)
-        return(''.join(tmp))
+        return(binascii.hexlify(self.digest()))
     
     
 def main():
@@ -82,7 +174,8 @@ def main():
     message = 'This is a message'
     message = ''
 
-    print('# Testing this code (TC) against Python built-in (BI)')
+    print('# Testing this code (TC) and its fast engine (FE) against Python '
+          'built-in (BI)')
     print('# Hashing Message:"%s"' % message)
     print('#' * 79)
     
@@ -96,6 +189,10 @@ def main():
     sha = SHA(160)
     sha.update(message)
     print(sha.hexdigest())
+    print('FE:'),
+    sha = SHA(160, engine='fast')
+    sha.update(message)
+    print(sha.hexdigest())
     print('#' * 79)
     
     print('# - Sha 224')
@@ -107,6 +204,10 @@ def main():
     sha = SHA(224)
     sha.update(message)
     print(sha.hexdigest())
+    print('FE:'),
+    sha = SHA(224, engine='fast')
+    sha.update(message)
+    print(sha.hexdigest())
     print('#' * 79)
 
     print('# - Sha 256')
@@ -118,6 +219,10 @@ def main():
     sha = SHA(256)
     sha.update(message)
     print(sha.hexdigest())
+    print('FE:'),
+    sha = SHA(256, engine='fast')
+    sha.update(message)
+    print(sha.hexdigest())
     print('#' * 79)
 
     print('# - Sha 384')
@@ -129,6 +234,10 @@ def main():
     sha = SHA(384)
     sha.update(message)
     print(sha.hexdigest())
+    print('FE:'),
+    sha = SHA(384, engine='fast')
+    sha.update(message)
+    print(sha.hexdigest())
     print('#' * 79)    
     
     print('# - Sha 512')
@@ -140,6 +249,10 @@ def main():
     sha = SHA(512)
     sha.update(message)
     print(sha.hexdigest())
+    print('FE:'),
+    sha = SHA(512, engine='fast')
+    sha.update(message)
+    print(sha.hexdigest())
     print('#' * 79)    
     
     print('# - Sha 512/224')
@@ -147,6 +260,10 @@ def main():
     sha = SHA('512:224')
     sha.update(message)
     print(sha.hexdigest())
+    print('FE:'),
+    sha = SHA('512:224', engine='fast')
+    sha.update(message)
+    print(sha.hexdigest())
     print('#' * 79)
 
     print('# - Sha 512/256')
@@ -154,6 +271,10 @@ def main():
     sha = SHA('512:256')
     sha.update(message)
     print(sha.hexdigest())
+    print('FE:'),
+    sha = SHA('512:256', engine='fast')
+    sha.update(message)
+    print(sha.hexdigest())
     print('#' * 79)
 
 if __name__ == '__main__':
@@ -13,23 +13,46 @@
 # that these kinds of bitwise behaviours are original platform depending.
 # The PUB 180-3 assumes intel like behaviour and this how this type behaves.
 """ """
+import string
+
 class Bits(object):
+    # The tables are shared by all instances, as are the attributes names, so
+    # that an instance only holds its three values.
+    __slots__ = ('_negative', '_bit_size', '_binary')
+    _bitwise = {'and':{('0', '0'):'0',
+                       ('0', '1'):'0',
+                       ('1', '0'):'0',
+                       ('1', '1'):'1'},
+                'xor':{('0', '0'):'0',
+                       ('0', '1'):'1',
+                       ('1', '0'):'1',
+                       ('1', '1'):'0'},
+                 'or':{('0', '0'):'0',
+                       ('0', '1'):'1',
+                       ('1', '0'):'1',
+                       ('1', '1'):'1'}}
+    # Complement of every bit in one pass, with str.translate
+    _complement = string.maketrans('01', '10')
+    # The bits of every hexadecimal digit and of every byte, and back. Python
+    # converts between integers and hexadecimal text in linear time, so these
+    # are used instead of converting bit by bit.
+    _hex_bits = dict()
+    _bits_hex = dict()
+    for _digit in range(16):
+        _bits = '%s%s%s%s' % (_digit >> 3, _digit >> 2 & 1, _digit >> 1 & 1,
+                              _digit & 1)
+        _hex_bits['%x' % _digit] = _bits
+        _bits_hex[_bits] = '%x' % _digit
+    _byte_bits = list()
+    for _digit in range(256):
+        _byte_bits.append(_hex_bits['%x' % (_digit >> 4)] +
+                          _hex_bits['%x' % (_digit & 15)])
+    del _digit, _bits
+
     def __init__(self, content='', bit_size=0):
         self._negative = False 
         self._bit_size = bit_size
         self._binary = ''
-        self._bitwise = {'and':{'00':'0',
-                                '01':'0',
-                                '10':'0',
-                                '11':'1'},
-                         'xor':{'00':'0',
-                                '01':'1',
-                                '10':'1',
-                                '11':'0'},
-                          'or':{'00':'0',
-                                '01':'1',
-                                '10':'1',
-                                '11':'1'}}
 
         if isinstance(content, (str, unicode)):
             self._set_string(content)
@@ -59,10 +82,8 @@ class Bits(object):
                 self._binary = self._binary[-self._bit_size:]
             
     def _all_bits(self, string):
-        replace = ['0', '1']
-        for character in replace:
-            string = string.replace(character, '')
-        if len(string) == 0:
+        # Nothing is left after stripping the bits off, if it is all bits.
+        if len(string.strip('01')) == 0:
             return(True)
         else:
             return(False) 
@@ -97,13 +118,10 @@ class Bits(object):
             value = value * -1
             prefix = '-'
             
-        tmp = list()
-        while value > 0:
-            append = value % 2
-            tmp.insert(0, str(append))
-            value = value / 2
-        
-        binary = prefix +'0b' + ''.join(tmp)
+        # Every hexadecimal digit is 4 bits, without the leading zeros.
+        hexed = '%x' % value
+        tmp = [self._hex_bits[digit] for digit in hexed]
+        binary = prefix +'0b' + ''.join(tmp).lstrip('0')
         return(binary)
 
     def _set_text(self, string):
@@ -111,12 +129,12 @@ class Bits(object):
         tmp.append(self._binary)
         for byte in string:
             numeric = ord(byte)
-            binary = self._bin(numeric)[3:].zfill(8)
+            binary = self._byte_bits[numeric]
             tmp.append(binary)
         self._binary = ''.join(tmp)
             
     def _set_bits(self, bits):
-        self._binary = bits.split('b')[1]
+        self._binary = str(bits.split('b')[1])
         if bits.startswith('-'):
             self._negative = True
             
@@ -128,26 +146,24 @@ class Bits(object):
         
         
     def _equalise_length(self, them):
-        len_them = len(them)
-        len_self = len(self)
-        
-        one = Bits(self)
-        two = Bits(them)
-        
-        if len_them > len_self:
-            one._binary = one._binary.zfill(len_them)
-        else:
-            two._binary = two._binary.zfill(len_self)
+        # Returns the binaries of self and them, the shorter one zero filled
+        # to the length of the other. These are strings, which are immutable,
+        # so nothing is copied if the lengths are already equal.
+        mine = self._binary
+        theirs = them._binary
+        if len(theirs) > len(mine):
+            mine = mine.zfill(len(theirs))
+        elif len(mine) > len(theirs):
+            theirs = theirs.zfill(len(mine))
             
-        return(one, two)
+        return(mine, theirs)
             
     
-    def _flip_bits(self):
-        if self._negative:
-            self._binary = self._binary.replace('1', 'T')
-            self._binary = self._binary.replace('0', '1')
-            self._binary = self._binary.replace('T', '0')
-            self._negative = False
+    def _flip_bits(self, binary, negative):
+        # The complement of binary if negative is set.
+        if negative:
+            binary = binary.translate(self._complement)
+        return(binary)
         
     def __invert__(self):
         bits = Bits(self)
@@ -159,15 +175,14 @@ class Bits(object):
         return(bits)
     
     def _bitwise_operation(self, operation, them):
-        mine, them = self._equalise_length(them)
-        mine._flip_bits()
-        them._flip_bits()
-        tmp = list()
-        for bit_pair in zip(mine._binary, them._binary):
-            bits = ''.join(bit_pair)
-            tmp.append(self._bitwise[operation][bits])
-            
-        binary = ''.join(tmp)
+        if not isinstance(them, Bits):
+            them = Bits(them)
+        mine, theirs = self._equalise_length(them)
+        mine = self._flip_bits(mine, self._negative)
+        theirs = self._flip_bits(theirs, them._negative)
+        table = self._bitwise[operation]
+        binary = ''.join([table[bit_pair]
+                          for bit_pair in zip(mine, theirs)])
         bits = Bits()
         bits._binary = binary
         bits._bit_size = self._bit_size
@@ -183,11 +198,14 @@ class Bits(object):
         return(self._bitwise_operation('xor', other))
 
     def __add__(self, other):
-        one, two = self._equalise_length(other)
-        number_one = int(one)
-        number_two = int(two)
+        # Zero filling does not change the value, so the numbers are added
+        # as they are.
+        if not isinstance(other, Bits):
+            other = Bits(other)
+        number_one = int(self)
+        number_two = int(other)
         value = number_one + number_two
-        bits = Bits(value, one._bit_size)
+        bits = Bits(value, self._bit_size)
         return(bits)
     
     def __repr__(self):
@@ -200,16 +218,13 @@ class Bits(object):
     def __int__(self):
         # Some interpreters, don't like three arguments indices and some 
         # others don't have the reverse method in list or the int type does 
-        # not cope with binary, so doing it the hard way.
-        integer = 0
-        reversed_list = list()
-        for character in self._binary:
-            reversed_list.insert(0, character)
-
-        for index, bit in enumerate(reversed_list):
-            if bit == '1':
-                plus = 2**index
-                integer += plus
+        # not cope with binary, so doing it the hard way; 4 bits at a time
+        # as hexadecimal, which the int type does cope with.
+        binary = self._binary
+        binary = binary.zfill(len(binary) + (-len(binary) % 4))
+        tmp = [self._bits_hex[binary[index:index + 4]]
+               for index in range(0, len(binary), 4)]
+        integer = int('0' + ''.join(tmp), 16)
 
         if self._negative:
             integer = -1 * integer 
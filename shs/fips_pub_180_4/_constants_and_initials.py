@@ -10,6 +10,8 @@
 # 4.2 Constants
 ################################################################################
 """ """
+from _binary import Bits
+
 # 4.2.1 SHA-1 Constants
 #                # Value    From  Till
 _K_SHA_1_RANGE = [[0x5a827999,  0, 20],
@@ -147,4 +149,24 @@ H0_SHA_512_256 = {0: 0x22312194FC2BF72C,
                   5: 0xBE5E1E2553863992,
                   6: 0x2B0199FC2C85B8AA,
                   7: 0x0EB72DDC81C52CA2}
-################################################################################
\ No newline at end of file
+################################################################################
+
+# Implementation note; the above are plain numbers, converting these to Bits
+# for every round of every block is wasteful, so they are converted once here.
+# The resulting tuples are shared by every hash computation, so the words in
+# them must never be modified (Bits.append), which the computations don't.
+def _words(table, size_word):
+    return(tuple(Bits(table[index], size_word) for index in sorted(table)))
+
+K_SHA_1_BITS = _words(K_SHA_1, 32)
+K_SHA_224_BITS = K_SHA_256_BITS = _words(K_SHA_256, 32)
+K_SHA_384_BITS = K_SHA_512_BITS = _words(K_SHA_512, 64)
+K_SHA_512_224_BITS = K_SHA_512_256_BITS = K_SHA_512_BITS
+
+H0_SHA_1_BITS = _words(H0_SHA_1, 32)
+H0_SHA_224_BITS = _words(H0_SHA_224, 32)
+H0_SHA_256_BITS = _words(H0_SHA_256, 32)
+H0_SHA_384_BITS = _words(H0_SHA_384, 64)
+H0_SHA_512_BITS = _words(H0_SHA_512, 64)
+H0_SHA_512_224_BITS = _words(H0_SHA_512_224, 64)
+H0_SHA_512_256_BITS = _words(H0_SHA_512_256, 64)
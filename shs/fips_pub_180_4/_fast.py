@@ -0,0 +1,119 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# ============================================================================
+# Copyright (c) Martin P. Hellwig <martin.hellwig@gmail.com> 14 Mar 2013
+# All rights reserved.
+# ============================================================================
+#
+# This implements the fast engine, the same functions as in the _sha_*
+# modules but working on native python integers instead of on Bits.
+# Python integers are unbounded, so after every operation that can overflow
+# the word size the result is masked with the word size, this gives the
+# addition modulo 2**w as specified in 2.2.2.
+# The complement of a python integer is negative, but as it is always 'and'ed
+# with a positive word the result is correct nonetheless.
+#
+# The SHA-2 variants all share the hash computation of their family, see
+# _sha_2, so only SHA-1 is implemented here.
+#
+# The _sha_* modules remain the reference, this module is only here for
+# speed. It is selected with SHA(digest_size, engine='fast').
+""" """
+from _constants_and_initials import K_SHA_1, H0_SHA_1
+import _sha_2
+from _sha_2 import intermediate
+
+MASK_32 = 0xffffffff
+MASK_64 = 0xffffffffffffffff
+
+# 4.1 Functions, these are word size independent
+def function_ch(x, y, z):
+    # 4.1.1 - (4.1) / 4.1.2 - (4.2) / 4.1.3 - (4.8)
+    return((x & y) ^ (~x & z))
+
+def function_maj(x, y, z):
+    # 4.1.1 - (4.1) / 4.1.2 - (4.3) / 4.1.3 - (4.9)
+    return((x & y) ^ (x & z) ^ (y & z))
+
+def function_parity(x, y, z):
+    # 4.1.1 - (4.1)
+    return(x ^ y ^ z)
+
+# 2.2.2 Symbols and Operations, these are word size dependent
+# The mask is the word mask, unless several words are packed into one integer
+# (see _swar), in which case it masks every packed word.
+def rotate_left(x, amount, mask=MASK_32):
+    # ROTLn(x), only used by SHA-1 which has 32 bits words
+    return(((x << amount) | (x >> (32 - amount))) & mask)
+
+SHA1_FUNCTIONS = dict() # 4.1.1 - (4.1) # Map the logical functions
+for index in range(0, 20):
+    SHA1_FUNCTIONS[index] = function_ch
+for index in range(20, 40):
+    SHA1_FUNCTIONS[index] = function_parity
+for index in range(40, 60):
+    SHA1_FUNCTIONS[index] = function_maj
+for index in range(60, 80):
+    SHA1_FUNCTIONS[index] = function_parity
+
+
+def schedule_1(words, mask=MASK_32):
+    # 6.1.2 Step 1. Prepare the message schedule
+    schedule = list(words)
+    for index in range(16, 80):
+        word = (schedule[index-3] ^ schedule[index-8] ^
+                schedule[index-14] ^ schedule[index-16])
+        schedule.append(rotate_left(word, 1, mask))
+    return(schedule)
+
+
+def rounds_1(hash_value, schedule, mask=MASK_32, constants=K_SHA_1):
+    # 6.1.2 Step 2. Initialize the working variables
+    a, b, c, d, e = hash_value
+
+    # Step 3. 80 rounds of calculation
+    for index in range(80):
+        ft = SHA1_FUNCTIONS[index]
+        t = (rotate_left(a, 5, mask) + ft(b, c, d) + e + constants[index] +
+             schedule[index]) & mask
+        e = d
+        d = c
+        c = rotate_left(b, 30, mask)
+        b = a
+        a = t
+    return(a, b, c, d, e)
+
+
+def compress_1(hash_value, words, mask=MASK_32, constants=K_SHA_1):
+    # 6.1.2 SHA-1 Hash Computation, for a single block.
+    schedule = schedule_1(words, mask)
+    working = rounds_1(hash_value, schedule, mask, constants)
+    return(intermediate(hash_value, working, mask))
+
+
+class Algorithm(object):
+    """The fast engine counterpart of a _sha_* module, it provides the same
+    SIZE_WORD, SIZE_BLOCK, initial and compress. The digest is taken from the
+    hash value by SHA itself, so there is no output."""
+    def __init__(self, size_word, compress, constants, initial_hash_value,
+                 digest_size):
+        self.SIZE_WORD = size_word
+        self.SIZE_BLOCK = size_word * 16
+        self.SIZE_DIGEST = digest_size
+        self.compress = compress
+        self.constants = constants
+        self._initial = tuple(initial_hash_value[index]
+                              for index in sorted(initial_hash_value))
+
+    def initial(self):
+        return(self._initial)
+
+
+DIGESTS = {160:Algorithm(32, compress_1, K_SHA_1, H0_SHA_1, 160)}
+for _name, _descriptor in _sha_2.DESCRIPTORS.items():
+    _family = _sha_2.family(_name)
+    DIGESTS[_name] = Algorithm(_family.SIZE_WORD, _family.compress,
+                               _descriptor['family']['constants'],
+                               _descriptor['initial'],
+                               _descriptor['digest_size'])
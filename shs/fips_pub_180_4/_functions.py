@@ -7,14 +7,51 @@
 # ============================================================================
 #
 """ """
-from _binary import Bits
+import struct
 
-def pad(message, size):
-    "Pad message to size, so that length message modulo size is 0"
+# The struct formats for one block of 16 words, for the message length and
+# for a number (to fill in) of words.
+FORMAT_BLOCK = {32:'>16I', 64:'>16Q'}
+FORMAT_LENGTH = {512:'>Q', 1024:'>QQ'}
+FORMAT_WORDS = {32:'>%sI', 64:'>%sQ'}
+
+def view(message):
+    """Return a memoryview of the bytes of message, without copying them. The
+    message can be any object with the buffer interface, like a bytestring,
+    bytearray, memoryview, array.array or mmap.mmap. Unicode text is encoded
+    as ASCII, as hashlib does, other text must be encoded first."""
+    if isinstance(message, unicode):
+        # Its buffer is the internal representation, not any encoding.
+        message = message.encode('ascii')
+    try:
+        tmp = memoryview(message)
+    except TypeError:
+        # In python 2 array.array and mmap.mmap only have the old buffer
+        # interface, a buffer object of them has the new one as well.
+        return(memoryview(buffer(message)))
+    if tmp.itemsize == 1:
+        return(tmp)
+
+    # Items wider than a byte, of which len and slicing would count items.
+    # A buffer object of it is per byte, a python 2 memoryview can not be
+    # made into one (nor cast), so that is the only case which is copied.
+    try:
+        return(memoryview(buffer(message)))
+    except TypeError:
+        return(memoryview(tmp.tobytes()))
+
+
+def pad(message, size, length=None):
+    """Pad message to size, so that length message modulo size is 0. Only the
+    padded final block(s) are returned, which are the remainder of the message
+    after the last complete block. The length is the bit length of the whole
+    message, which must be given if only the tail of the message is given."""
     # 5.1 Padding the Message
     # Implementation note; because of the similarities of padding to 512 or 1024
     # and it is not 'core' to the algorithm, both "5.1.1 SHA-1, SHA-224 and 
     # SHA-256" and "5.1.2 SHA-384 and SHA-512" are implemented as one. 
+    # As the message is a bytestring its length in bits is always a multiple
+    # of 8, so the padding can be done on bytes instead of on bits.
     allowed_sizes = [512, 1024]
     if size not in allowed_sizes:
         text = "Split size '%s' not allowed must be in: %s"
@@ -25,16 +62,79 @@ def pad(message, size):
     elif size == 1024:
         pad_len = 128
     
-    message = Bits(message)
-    pad_txt = Bits(len(message), pad_len)
-    message.append('1')
-    
+    message = view(message)
+    if length is None:
+        length = len(message) * 8
+        
+    size_bytes = size // 8
+    remainder = len(message) % size_bytes
+    tail = message[len(message) - remainder:].tobytes()
     
-    length = len(message) + pad_len
-    delta = length % size
-    padding = size - delta
-    padding = '0' * padding
+    # The bit '1' followed by 7 of the k zero bits.
+    one = '\x80'
+    # The remaining zero bits, so that the length ends on the block boundary.
+    padding = -(remainder + 1 + pad_len // 8) % size_bytes
+    padding = '\x00' * padding
+    # The length of the message in pad_len bits.
+    if pad_len == 64:
+        pad_txt = struct.pack(FORMAT_LENGTH[size], length)
+    else:
+        pad_txt = struct.pack(FORMAT_LENGTH[size], length >> 64,
+                              length & 0xffffffffffffffff)
     
-    message.append(padding)
-    message.append(pad_txt)
-    return(message)     
\ No newline at end of file
+    return(tail + one + padding + pad_txt)
+
+
+def parse(message, size_block, size_word):
+    """Parse the complete blocks of the message, each block is returned as a
+    tuple of its 16 words. A remainder shorter than a block is ignored."""
+    # 5.2 Parsing the Padded Message
+    # The blocks are read through a memoryview so that they are not copied.
+    message = view(message)
+    size = size_block // 8
+    block_format = FORMAT_BLOCK[size_word]
+    offset = 0
+    while offset + size <= len(message):
+        yield(struct.unpack(block_format, message[offset:offset + size]))
+        offset += size
+
+
+def group(messages, size):
+    """Pad every message to size and group them by their number of blocks.
+    Returns a dictionary of the number of blocks to a list of the index of the
+    message and the padded message."""
+    # For hashing several messages together, which requires that they all
+    # have the same number of blocks.
+    size_bytes = size // 8
+    groups = dict()
+    for index, message in enumerate(messages):
+        complete = len(message) - len(message) % size_bytes
+        padded = message[:complete] + pad(message, size)
+        blocks = len(padded) // size_bytes
+        groups.setdefault(blocks, list()).append((index, padded))
+    return(groups)
+
+
+class MessageSchedule(object):
+    """The message schedule of a block, computed on demand. The words must be
+    asked for once each, in order, as the rounds do; word t is computed by
+    expand(window, t) from the 16 words before it. Only those 16 words are
+    kept, in window, where word t is at t % 16. Asking for any other word
+    than the next raises IndexError, as the window no longer has it."""
+    def __init__(self, window, expand):
+        self._window = window
+        self._expand = expand
+        self._next = 0
+
+    def __getitem__(self, index):
+        if index != self._next:
+            text = "Word '%s' not allowed must be the next word: %s"
+            raise(IndexError(text % (index, self._next)))
+        self._next += 1
+        # 6.1.2, 6.2.2 and 6.4.2 Step 1, every word of the schedule only
+        # depends on the 16 words before it, so word t replaces word t-16.
+        if index < 16:
+            return(self._window[index])
+        word = self._expand(self._window, index)
+        self._window[index % 16] = word
+        return(word)
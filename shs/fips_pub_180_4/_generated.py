@@ -0,0 +1,167 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# ============================================================================
+# Copyright (c) Martin P. Hellwig <martin.hellwig@gmail.com> 14 Mar 2013
+# All rights reserved.
+# ============================================================================
+#
+# This implements the generated engine, the same hash computation as the fast
+# engine but as straight line python source, generated and compiled when this
+# module is imported. Every round is written out, with the constants and the
+# rotation amounts as literals, so that nothing is looked up or called per
+# round. It is selected with SHA(digest_size, engine='generated').
+#
+# Instead of moving the working variables along every round, every round
+# gives its new values a name of their own:
+#   SHA-1   - round t computes a<t+2> (the new a) and c<t+3> (the new c), b
+#             is the a and d and e are the c of previous rounds.
+#   SHA-2   - round t computes a<t+4> (the new a) and e<t+4> (the new e), b,
+#             c and d are the a and f, g and h are the e of previous rounds.
+# The words of the message schedule are named w<t> and each is computed just
+# before the round that uses it.
+#
+# The source of every generated function is kept in SOURCES, by name.
+""" """
+from _constants_and_initials import K_SHA_1, H0_SHA_1
+from _fast import Algorithm
+import _sha_2
+
+SOURCES = dict()
+
+# 4.1.1 - (4.1) SHA-1 functions, written in an equivalent form with one
+# operation less than in the specification.
+SHA_1_FUNCTIONS = [(20, '(%(d)s ^ (%(b)s & (%(c)s ^ %(d)s)))'),        # Ch
+                   (40, '(%(b)s ^ %(c)s ^ %(d)s)'),                    # Parity
+                   (60, '((%(b)s & %(c)s) | (%(d)s & (%(b)s | %(c)s)))'), # Maj
+                   (80, '(%(b)s ^ %(c)s ^ %(d)s)')]                    # Parity
+
+def _rotate_right(name, amount, size_word):
+    # ROTRn(x), not masked.
+    return('((%s >> %s) | (%s << %s))' % (name, amount, name,
+                                          size_word - amount))
+
+
+def _rotate_left(name, amount, size_word):
+    # ROTLn(x), not masked.
+    return('((%s << %s) | (%s >> %s))' % (name, amount, name,
+                                          size_word - amount))
+
+
+def _sigma(name, amounts, size_word, shift):
+    # The sigma functions, three rotations or two rotations and a shift,
+    # not masked.
+    tmp = [_rotate_right(name, amount, size_word) for amount in amounts[:2]]
+    if shift:
+        tmp.append('(%s >> %s)' % (name, amounts[2]))
+    else:
+        tmp.append(_rotate_right(name, amounts[2], size_word))
+    return('(%s)' % ' ^ '.join(tmp))
+
+
+def source_1(name='compress_1'):
+    "Return the source of the SHA-1 compression of a block (6.1.2)."
+    mask = '0x%x' % 0xffffffff
+    lines = ['def %s(hash_value, words):' % name,
+             '    # 6.1.2 SHA-1 Hash Computation, for a single block.',
+             '    a1, a0, c2, c1, c0 = hash_value',
+             '    %s = words' % ', '.join(['w%s' % index
+                                           for index in range(16)])]
+    phase = 0
+    for index in range(80):
+        if index >= 16:
+            # Step 1. Prepare the message schedule
+            lines.append('    x = w%s ^ w%s ^ w%s ^ w%s' % (
+                         index - 3, index - 8, index - 14, index - 16))
+            lines.append('    w%s = %s & %s' % (
+                         index, _rotate_left('x', 1, 32), mask))
+        # Step 3. The round
+        while index >= SHA_1_FUNCTIONS[phase][0]:
+            phase += 1
+        names = {'b':'a%s' % index, 'c':'c%s' % (index + 2),
+                 'd':'c%s' % (index + 1)}
+        ft = SHA_1_FUNCTIONS[phase][1] % names
+        lines.append('    a%s = (%s + %s + c%s + 0x%x + w%s) & %s' % (
+                     index + 2, _rotate_left('a%s' % (index + 1), 5, 32), ft,
+                     index, K_SHA_1[index], index, mask))
+        lines.append('    c%s = %s & %s' % (
+                     index + 3, _rotate_left('a%s' % index, 30, 32), mask))
+    # Step 4. compute the intermediate hash value
+    working = ['a81', 'a80', 'c82', 'c81', 'c80']
+    lines.append('    h0, h1, h2, h3, h4 = hash_value')
+    lines.append('    return(%s)' % ', '.join(
+                 ['(h%s + %s) & %s' % (index, word, mask)
+                  for index, word in enumerate(working)]))
+    return('\n'.join(lines) + '\n')
+
+
+def source_2(descriptor, name):
+    """Return the source of the SHA-2 compression of a block (6.2.2 and
+    6.4.2) for the family descriptor, see _sha_2."""
+    size_word = descriptor['size_word']
+    constants = descriptor['constants']
+    mask = '0x%x' % ((1 << size_word) - 1)
+    lines = ['def %s(hash_value, words):' % name,
+             '    # 6.2.2 and 6.4.2 Hash Computation, for a single block.',
+             '    a3, a2, a1, a0, e3, e2, e1, e0 = hash_value',
+             '    %s = words' % ', '.join(['w%s' % index
+                                           for index in range(16)])]
+    for index in range(descriptor['rounds']):
+        if index >= 16:
+            # Step 1. Prepare the message schedule
+            lines.append('    w%s = (%s + w%s + %s + w%s) & %s' % (
+                         index,
+                         _sigma('w%s' % (index - 2),
+                                descriptor['sigma_lower_1'], size_word, True),
+                         index - 7,
+                         _sigma('w%s' % (index - 15),
+                                descriptor['sigma_lower_0'], size_word, True),
+                         index - 16, mask))
+        # Step 3. The round
+        a, b, c, d = ['a%s' % (index + offset) for offset in (3, 2, 1, 0)]
+        e, f, g, h = ['e%s' % (index + offset) for offset in (3, 2, 1, 0)]
+        lines.append('    t1 = %s + (%s & %s) + (%s ^ (%s & (%s ^ %s))) + '
+                     '0x%x + w%s' % (h, _sigma(e, descriptor['sigma_upper_1'],
+                                               size_word, False),
+                                     mask, g, e, f, g, constants[index],
+                                     index))
+        lines.append('    t2 = (%s & %s) + ((%s & %s) | (%s & (%s | %s)))' % (
+                     _sigma(a, descriptor['sigma_upper_0'], size_word, False),
+                     mask, a, b, c, a, b))
+        lines.append('    e%s = (%s + t1) & %s' % (index + 4, d, mask))
+        lines.append('    a%s = (t1 + t2) & %s' % (index + 4, mask))
+    # Step 4. compute the intermediate hash value
+    last = descriptor['rounds'] + 3
+    working = (['a%s' % (last - offset) for offset in range(4)] +
+               ['e%s' % (last - offset) for offset in range(4)])
+    lines.append('    h0, h1, h2, h3, h4, h5, h6, h7 = hash_value')
+    lines.append('    return(%s)' % ', '.join(
+                 ['(h%s + %s) & %s' % (index, word, mask)
+                  for index, word in enumerate(working)]))
+    return('\n'.join(lines) + '\n')
+
+
+def generate(source, name):
+    "Compile source and return the function name defined by it."
+    SOURCES[name] = source
+    namespace = dict()
+    exec(compile(source, '<generated %s>' % name, 'exec'), namespace)
+    return(namespace[name])
+
+
+compress_1 = generate(source_1(), 'compress_1')
+compress_256 = generate(source_2(_sha_2.SHA_256_FAMILY, 'compress_256'),
+                        'compress_256')
+compress_512 = generate(source_2(_sha_2.SHA_512_FAMILY, 'compress_512'),
+                        'compress_512')
+
+DIGESTS = {160:Algorithm(32, compress_1, K_SHA_1, H0_SHA_1, 160)}
+for _name, _descriptor in _sha_2.DESCRIPTORS.items():
+    _family = _descriptor['family']
+    if _family['size_word'] == 32:
+        _compress = compress_256
+    else:
+        _compress = compress_512
+    DIGESTS[_name] = Algorithm(_family['size_word'], _compress,
+                               _family['constants'], _descriptor['initial'],
+                               _descriptor['digest_size'])
@@ -8,13 +8,14 @@
 #
 """ """
 # 6.1 SHA-1 Hash Computation
-from _functions import pad
+from _functions import pad, parse, MessageSchedule
 from _binary import Bits
-from _constants_and_initials import H0_SHA_1, K_SHA_1
+from _constants_and_initials import H0_SHA_1_BITS, K_SHA_1_BITS
 
 # 1. Introduction - Figure 1: Secure Hash Algorithm Properties 
 SIZE_WORD = 32
 SIZE_BLOCK = 512
+SIZE_DIGEST = 160
 
 def rotate_left(word, amount):
     # 2.2.2 # ROTLn(x)
@@ -49,6 +50,97 @@ for index in range(60, 80):
     SHA1_FUNCTIONS[index] = function_parity
      
 
+def initial():
+    # 5.3 Setting the Initial Hash Value (H(0)) / 5.3.1 SHA-1
+    return(H0_SHA_1_BITS)
+
+
+def expand(window, index):
+    # 16 <= t <= 79
+    # Implementation Note: 
+    # The following code-block is an on-liner in the documentation.
+    # The window holds the 16 words before word t, word t-n at (t-n) % 16.
+    w03 = window[(index-3) % 16]
+    w08 = window[(index-8) % 16]
+    w14 = window[(index-14) % 16]
+    w16 = window[(index-16) % 16]
+    #
+    word = w03 ^ w08 ^ w14 ^ w16
+    word = rotate_left(word, 1)
+    #
+    return(word)
+
+
+def schedule(words):
+    # Step 1. Prepare the message schedule
+    # - 80 32 bits word values # 6.1 First Paragraph
+    # Implementation Note:
+    # Only 16 words are kept at a time, the words from 16 on are computed by
+    # expand when the rounds ask for them.
+
+    # 0 <= t <= 15
+    # This set's up the first 16 words, using the words in the block
+    # As the block can only have 16 words, we do not have to worry about
+    # remainders.
+    window = list()
+    for word in words:
+        word = Bits(word, SIZE_WORD)
+        window.append(word)
+    
+    return(MessageSchedule(window, expand))
+
+
+def rounds(hash_value, message_schedule):
+    h0, h1, h2, h3, h4 = hash_value
+    # Step 2. Initialize 5 working variables
+    a = h0
+    b = h1
+    c = h2
+    d = h3
+    e = h4
+        
+    # Step 3. 80 rounds of calculation
+    for index in range(80):               
+        ft =  SHA1_FUNCTIONS[index]
+        kt = K_SHA_1_BITS[index]
+        wt = message_schedule[index]
+        
+        t = rotate_left(a, 5) + ft(b, c, d) + e  + kt + wt
+        e = d 
+        d = c 
+        c = rotate_left(b, 30)
+        b = a 
+        a = t
+    
+    return(a, b, c, d, e)
+
+
+def intermediate(hash_value, working):
+    h0, h1, h2, h3, h4 = hash_value
+    a, b, c, d, e = working
+    # Step 4. compute the intermediate hash value    
+    h0 = a + h0 
+    h1 = b + h1 
+    h2 = c + h2 
+    h3 = d + h3
+    h4 = e + h4
+    
+    return(h0, h1, h2, h3, h4)
+
+
+def compress(hash_value, words):
+    # 6. SECURE HASH ALGORITHMS
+    # 6.1.2 SHA-1 Hash Computation
+    # ! Processing a single block, given as its 16 words
+    message_schedule = schedule(words)
+    working = rounds(hash_value, message_schedule)
+    return(intermediate(hash_value, working))
+
+
+def output(hash_value):
+    return(hash_value)
+
+
 def computation(message):
     # 6.1.1 SHA-1 Preprocessing
     # 5.1 Padding the Message
@@ -56,70 +148,10 @@ def computation(message):
     
     #  5.2 Parsing the Padded Message / 5.2.1 SHA-1
     #  ! Meaning splitting it into blocks of 512 bits
-    blocks = padded.split(SIZE_BLOCK)
-    
-    # 5.3 Setting the Initial Hash Value (H(0)) / 5.3.1 SHA-1
-    h0 = Bits(H0_SHA_1[0], SIZE_WORD)
-    h1 = Bits(H0_SHA_1[1], SIZE_WORD)
-    h2 = Bits(H0_SHA_1[2], SIZE_WORD)
-    h3 = Bits(H0_SHA_1[3], SIZE_WORD)
-    h4 = Bits(H0_SHA_1[4], SIZE_WORD)
-    
-    # 6. SECURE HASH ALGORITHMS
-    # 6.1.2 SHA-256 Hash Computation
-    for block in blocks:
-        # Step 1. Prepare the message schedule
-        # - Fill with 80 32 bits word values # 6.1 First Paragraph
-        message_schedule = dict()
-
-        # 0 <= t <= 15
-        # This set's up the first 16 words, using the words in the block
-        # As the block can only have 16 words, we do not have to worry about
-        # remainders.
-        for count, word in enumerate(block.split(SIZE_WORD)):
-            word = Bits(word, SIZE_WORD)
-            message_schedule[count] = word
-            
-        # 16 <= t <= 79
-        # This set's up the remaining 64 words
-        for index in range(16, 80):
-            # Implementation Note: 
-            # The following code-block is an on-liner in the documentation.
-            w03 = message_schedule[index-3]
-            w08 = message_schedule[index-8]
-            w14 = message_schedule[index-14]
-            w16 = message_schedule[index-16]
-            #
-            word = w03 ^ w08 ^ w14 ^ w16
-            word = rotate_left(word, 1)
-            #
-            message_schedule[index] = word
-        
-        # Step 2. Initialize 5 working variables
-        a = h0
-        b = h1
-        c = h2
-        d = h3
-        e = h4
-            
-        # Step 3. 80 rounds of calculation
-        for index in range(80):               
-            ft =  SHA1_FUNCTIONS[index]
-            kt = Bits(K_SHA_1[index], SIZE_WORD)
-            wt = message_schedule[index]
-            
-            t = rotate_left(a, 5) + ft(b, c, d) + e  + kt + wt
-            e = d 
-            d = c 
-            c = rotate_left(b, 30)
-            b = a 
-            a = t
-        
-        # Step 4. compute the intermediate hash value    
-        h0 = a + h0 
-        h1 = b + h1 
-        h2 = c + h2 
-        h3 = d + h3
-        h4 = e + h4
+    #  ! The complete blocks of the message followed by the padded block(s)
+    hash_value = initial()
+    for part in (message, padded):
+        for words in parse(part, SIZE_BLOCK, SIZE_WORD):
+            hash_value = compress(hash_value, words)
     
-    return(h0, h1, h2, h3, h4)
\ No newline at end of file
+    return(output(hash_value))
\ No newline at end of file
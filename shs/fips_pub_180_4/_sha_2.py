@@ -0,0 +1,161 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# ============================================================================
+# Copyright (c) Martin P. Hellwig <martin.hellwig@gmail.com> 14 Mar 2013
+# All rights reserved.
+# ============================================================================
+#
+# The SHA-2 hash computations (6.2 up to 6.7) only differ in word size, the
+# rotation and shift amounts of their functions, the number of rounds, the
+# constants, the initial hash value and how much of the output is used.
+# This module describes every SHA-2 variant by exactly that and builds the
+# hash computation once per word size (the family), on integers, with the
+# amounts bound into it. The fast engine uses these for all SHA-2 variants.
+#
+# The readable, FIPS annotated, computations remain in _sha_256 (for 32 bits
+# words) and _sha_512 (for 64 bits words).
+#
+# As in _fast the words are python integers masked to the word size, the
+# mask and constants can be given to compress for words packed in lanes.
+# The intermediate results of a rotation or shift are only masked once after
+# they are xor'ed, which gives the same result as masking each of them.
+""" """
+from _constants_and_initials import K_SHA_256, K_SHA_512
+from _constants_and_initials import H0_SHA_224, H0_SHA_256
+from _constants_and_initials import H0_SHA_384, H0_SHA_512
+from _constants_and_initials import H0_SHA_512_224, H0_SHA_512_256
+
+# The family descriptors, the amounts are of the three rotations, or two
+# rotations and a shift for the lower sigma functions.
+SHA_256_FAMILY = {'size_word':32,
+                  'rounds':64,
+                  'constants':K_SHA_256,
+                  'sigma_upper_0':(2, 13, 22),   # 4.1.2 - (4.4)
+                  'sigma_upper_1':(6, 11, 25),   # 4.1.2 - (4.5)
+                  'sigma_lower_0':(7, 18, 3),    # 4.1.2 - (4.6)
+                  'sigma_lower_1':(17, 19, 10)}  # 4.1.2 - (4.7)
+
+SHA_512_FAMILY = {'size_word':64,
+                  'rounds':80,
+                  'constants':K_SHA_512,
+                  'sigma_upper_0':(28, 34, 39),  # 4.1.3 - (4.10)
+                  'sigma_upper_1':(14, 18, 41),  # 4.1.3 - (4.11)
+                  'sigma_lower_0':(1, 8, 7),     # 4.1.3 - (4.12)
+                  'sigma_lower_1':(19, 61, 6)}   # 4.1.3 - (4.13)
+
+# The variant descriptors, the digest size is the number of left most bits
+# of the final hash value which are the output.
+DESCRIPTORS = {224:{'family':SHA_256_FAMILY,          # 6.3
+                    'initial':H0_SHA_224,
+                    'digest_size':224},
+               256:{'family':SHA_256_FAMILY,          # 6.2
+                    'initial':H0_SHA_256,
+                    'digest_size':256},
+               384:{'family':SHA_512_FAMILY,          # 6.5
+                    'initial':H0_SHA_384,
+                    'digest_size':384},
+               512:{'family':SHA_512_FAMILY,          # 6.4
+                    'initial':H0_SHA_512,
+                    'digest_size':512},
+               '512:224':{'family':SHA_512_FAMILY,    # 6.6
+                          'initial':H0_SHA_512_224,
+                          'digest_size':224},
+               '512:256':{'family':SHA_512_FAMILY,    # 6.7
+                          'initial':H0_SHA_512_256,
+                          'digest_size':256}}
+
+
+def _build_schedule(descriptor):
+    # Step 1. Prepare the message schedule, for the family.
+    size_word = descriptor['size_word']
+    rounds = descriptor['rounds']
+    r0_1, r0_2, s0 = descriptor['sigma_lower_0']
+    r1_1, r1_2, s1 = descriptor['sigma_lower_1']
+
+    def schedule(words, mask):
+        schedule = list(words)
+        for index in range(16, rounds):
+            x = schedule[index-15]
+            sl0 = (((x >> r0_1) | (x << (size_word - r0_1))) ^
+                   ((x >> r0_2) | (x << (size_word - r0_2))) ^ (x >> s0))
+            x = schedule[index-2]
+            sl1 = (((x >> r1_1) | (x << (size_word - r1_1))) ^
+                   ((x >> r1_2) | (x << (size_word - r1_2))) ^ (x >> s1))
+            word = (sl1 & mask) + schedule[index-7] + (sl0 & mask)
+            schedule.append((word + schedule[index-16]) & mask)
+        return(schedule)
+    return(schedule)
+
+
+def _build_rounds(descriptor):
+    # Step 2 and 3, initialize the working variables and do the rounds, for
+    # the family.
+    size_word = descriptor['size_word']
+    rounds = descriptor['rounds']
+    u0_1, u0_2, u0_3 = descriptor['sigma_upper_0']
+    u1_1, u1_2, u1_3 = descriptor['sigma_upper_1']
+
+    def rounds_(hash_value, schedule, mask, constants):
+        a, b, c, d, e, f, g, h = hash_value
+        for index in range(rounds):
+            su1 = (((e >> u1_1) | (e << (size_word - u1_1))) ^
+                   ((e >> u1_2) | (e << (size_word - u1_2))) ^
+                   ((e >> u1_3) | (e << (size_word - u1_3)))) & mask
+            ch = (e & f) ^ (~e & g)
+            t1 = h + su1 + ch + constants[index] + schedule[index]
+            su0 = (((a >> u0_1) | (a << (size_word - u0_1))) ^
+                   ((a >> u0_2) | (a << (size_word - u0_2))) ^
+                   ((a >> u0_3) | (a << (size_word - u0_3)))) & mask
+            ma = (a & b) ^ (a & c) ^ (b & c)
+            t2 = su0 + ma
+            h = g
+            g = f
+            f = e
+            e = (d + t1) & mask
+            d = c
+            c = b
+            b = a
+            a = (t1 + t2) & mask
+        return(a, b, c, d, e, f, g, h)
+    return(rounds_)
+
+
+def intermediate(hash_value, working, mask):
+    # 6.1.2, 6.2.2 and 6.4.2 Step 4. compute the intermediate hash value
+    return(tuple([(word + value) & mask
+                  for word, value in zip(working, hash_value)]))
+
+
+class Family(object):
+    """The SHA-2 hash computation on integers for the word size of the family
+    descriptor, with the functions specialized for it."""
+    def __init__(self, descriptor):
+        self.SIZE_WORD = descriptor['size_word']
+        self.SIZE_BLOCK = descriptor['size_word'] * 16
+        self.mask = (1 << descriptor['size_word']) - 1
+        self.constants = tuple(descriptor['constants'][index]
+                               for index in range(descriptor['rounds']))
+        # Instance attributes, so that these can be replaced (see instrument).
+        self.schedule = _build_schedule(descriptor)
+        self.rounds = _build_rounds(descriptor)
+        self.intermediate = intermediate
+
+    def compress(self, hash_value, words, mask=None, constants=None):
+        "The hash computation of a single block of 16 words."
+        if mask is None:
+            mask = self.mask
+        if constants is None:
+            constants = self.constants
+        schedule = self.schedule(words, mask)
+        working = self.rounds(hash_value, schedule, mask, constants)
+        return(self.intermediate(hash_value, working, mask))
+
+
+FAMILIES = {32:Family(SHA_256_FAMILY),
+            64:Family(SHA_512_FAMILY)}
+
+
+def family(digest_size):
+    "Return the family of the SHA-2 variant with digest_size."
+    return(FAMILIES[DESCRIPTORS[digest_size]['family']['size_word']])
@@ -9,14 +9,15 @@
 """ """
 # 6.5 SHA-384 Hash Computation (copy of SHA-512)
 # 6.4 SHA-512 Hash Computation
-from _functions import pad
+from _functions import pad, parse, MessageSchedule
 from _binary import Bits
 #from _constants_and_initials import H0_SHA_512, K_SHA512
-from _constants_and_initials import H0_SHA_384, K_SHA_384
+from _constants_and_initials import H0_SHA_384_BITS, K_SHA_384_BITS
 
 # 1. Introduction - Figure 1: Secure Hash Algorithm Properties
 SIZE_WORD = 64
 SIZE_BLOCK = 1024
+SIZE_DIGEST = 384
 
 def rotate_right(word, amount):
     # 2.2.2 Symbols and Operations # ROTRn(x)
@@ -63,94 +64,125 @@ def sigma_lower_512_1(x):
     return(value)
 
 
+def initial():
+    # 5.3 Setting the Initial Hash Value (H(0)) / 5.3.5 SHA-512
+    #hd = H0_SHA_512
+    hd = H0_SHA_384_BITS # 6.5 - 1
+    return(hd)
+
+
+def expand(window, index):
+    # Implementation Note: 
+    # The following code-block is an on-liner in the documentation,
+    # see the 16 <= t <= 79 part of the specification
+    # The window holds the 16 words before word t, word t-n at (t-n) % 16.
+    w02 = window[(index-2) % 16]
+    w07 = window[(index-7) % 16]
+    w15 = window[(index-15) % 16]
+    w16 = window[(index-16) % 16]
+    #
+    sl1 = sigma_lower_512_1(w02)
+    sl0 = sigma_lower_512_0(w15)
+    word = sl1 + w07 + sl0 + w16  
+    #
+    return(word)
+
+
+def schedule(words):
+    # Step 1. Prepare the message schedule
+    # - 80 64 bits word values
+    # Implementation Note:
+    # Only 16 words are kept at a time, the words from 16 on are computed by
+    # expand when the rounds ask for them.
+    window = list()
+    # This set's up the first 16 words, using the words in the block
+    # see the 0 <= t <= 15 part of the specification
+    for word in words:
+        word = Bits(word, SIZE_WORD)
+        window.append(word)
+    
+    return(MessageSchedule(window, expand))
+
+
+def rounds(hash_value, message_schedule):
+    h0, h1, h2, h3, h4, h5, h6, h7 = hash_value
+    # Step 2. Initialize working variables
+    a = h0
+    b = h1
+    c = h2
+    d = h3
+    e = h4
+    f = h5
+    g = h6
+    h = h7
+        
+    # Step 3. 80 rounds of calculation
+    # For t=0 to 79:
+    for index in range(80):
+        
+        kt = K_SHA_384_BITS[index]
+        wt = message_schedule[index]
+        ch = function_ch(e, f, g)
+        s1 = sigma_upper_512_1(e)
+        t1 = h + s1 + ch + kt + wt
+        
+        s0 = sigma_upper_512_0(a)
+        ma = function_maj(a, b, c)
+        t2 = s0 + ma
+        
+        h = g
+        g = f
+        f = e 
+        e = d + t1
+        d = c 
+        c = b 
+        b = a 
+        a = t1 + t2
+    
+    return(a, b, c, d, e, f, g, h)
+
+
+def intermediate(hash_value, working):
+    h0, h1, h2, h3, h4, h5, h6, h7 = hash_value
+    a, b, c, d, e, f, g, h = working
+    # Step 4. compute the intermediate hash value    
+    h0 = a + h0
+    h1 = b + h1
+    h2 = c + h2
+    h3 = d + h3
+    h4 = e + h4
+    h5 = f + h5
+    h6 = g + h6
+    h7 = h + h7
+    
+    return(h0, h1, h2, h3, h4, h5, h6, h7)
+
+
+def compress(hash_value, words):
+    # 6. SECURE HASH ALGORITHMS
+    # 6.4.2 SHA-512 Hash Computation
+    # ! Processing a single block, given as its 16 words
+    message_schedule = schedule(words)
+    working = rounds(hash_value, message_schedule)
+    return(intermediate(hash_value, working))
+
+
+def output(hash_value):
+    h0, h1, h2, h3, h4, h5, h6, h7 = hash_value
+    #return(h0, h1, h2, h3, h4, h5, h6, h7)
+    return(h0, h1, h2, h3, h4, h5) # 6.5 - 2
+
+
 def computation(message):
     # 6.4.1 SHA-512 Preprocessing
     # 5.1.2 Padding the Message
     padded = pad(message, SIZE_BLOCK)
     #  5.2.2 Parsing the Padded Message 
     #  ! Meaning splitting it into blocks of 1024 bits
-    blocks = padded.split(SIZE_BLOCK)
-    # 5.3 Setting the Initial Hash Value (H(0)) / 5.3.5 SHA-512
-    #hd = H0_SHA_512
-    hd = H0_SHA_384 # 6.5 - 1
-    h0 = Bits(hd[0], SIZE_WORD)
-    h1 = Bits(hd[1], SIZE_WORD)
-    h2 = Bits(hd[2], SIZE_WORD)
-    h3 = Bits(hd[3], SIZE_WORD)
-    h4 = Bits(hd[4], SIZE_WORD)
-    h5 = Bits(hd[5], SIZE_WORD)
-    h6 = Bits(hd[6], SIZE_WORD)
-    h7 = Bits(hd[7], SIZE_WORD)
-    # 6. SECURE HASH ALGORITHMS
-    # 6.4.2 SHA-512 Hash Computation
-    for block in blocks:
-        # Step 1. Prepare the message schedule
-        # - Fill with 80 64 bits word values
-        message_schedule = dict()
-        # This set's up the first 16 words, using the words in the block
-        # see the 0 <=t<=15 part of the specification
-        for count, word in enumerate(block.split(SIZE_WORD)):
-            word = Bits(word, SIZE_WORD)
-            message_schedule[count] = word
-            
-        # This set's up the remaining 64 words
-        for index in range(16, 80):
-            # Implementation Note: 
-            # The following code-block is an on-liner in the documentation,
-            # see the 16 <=t<=79 part of the specification
-            w02 = message_schedule[index-2]
-            w07 = message_schedule[index-7]
-            w15 = message_schedule[index-15]
-            w16 = message_schedule[index-16]
-            #
-            sl1 = sigma_lower_512_1(w02)
-            sl0 = sigma_lower_512_0(w15)
-            word = sl1 + w07 + sl0 + w16  
-            #
-            message_schedule[index] = word
-        
-        # Step 2. Initialize working variables
-        a = h0
-        b = h1
-        c = h2
-        d = h3
-        e = h4
-        f = h5
-        g = h6
-        h = h7
-            
-        # Step 3. 80 rounds of calculation
-        # For t=0 to 79:
-        for index in range(80):
-            
-            kt = Bits(K_SHA_384[index], SIZE_WORD)
-            wt = message_schedule[index]
-            ch = function_ch(e, f, g)
-            s1 = sigma_upper_512_1(e)
-            t1 = h + s1 + ch + kt + wt
-            
-            s0 = sigma_upper_512_0(a)
-            ma = function_maj(a, b, c)
-            t2 = s0 + ma
-            
-            h = g
-            g = f
-            f = e 
-            e = d + t1
-            d = c 
-            c = b 
-            b = a 
-            a = t1 + t2
-        
-        # Step 4. compute the intermediate hash value    
-        h0 = a + h0
-        h1 = b + h1
-        h2 = c + h2
-        h3 = d + h3
-        h4 = e + h4
-        h5 = f + h5
-        h6 = g + h6
-        h7 = h + h7
+    #  ! The complete blocks of the message followed by the padded block(s)
+    hash_value = initial()
+    for part in (message, padded):
+        for words in parse(part, SIZE_BLOCK, SIZE_WORD):
+            hash_value = compress(hash_value, words)
     
-    #return(h0, h1, h2, h3, h4, h5, h6, h7)
-    return(h0, h1, h2, h3, h4, h5) # 6.5 - 2
\ No newline at end of file
+    return(output(hash_value))
\ No newline at end of file
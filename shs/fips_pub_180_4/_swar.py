@@ -0,0 +1,92 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# ============================================================================
+# Copyright (c) Martin P. Hellwig <martin.hellwig@gmail.com> 14 Mar 2013
+# All rights reserved.
+# ============================================================================
+#
+# This implements hashing several messages at once, by packing a word of
+# every message (a lane) into one python integer, a SIMD within a register
+# (SWAR) approach which needs nothing beyond python itself.
+#
+# Every lane is twice the word size, the lower half holds the word and the
+# upper half are guard bits. The guard bits catch the carries of additions and
+# the bits shifted out of the word by rotations and shifts. Masking with the
+# lane mask, the word mask repeated for every lane, clears the guard bits
+# again, which is exactly what the fast engine already does with its word
+# mask. So the compression functions of _fast are used as they are, with the
+# lane mask and with the constants repeated for every lane.
+""" """
+import struct
+from _functions import group
+from _fast import DIGESTS
+
+LANES = 256 # Default number of messages packed together
+
+def lane_mask(lanes, size_word):
+    "Return the word mask repeated for every lane."
+    nibbles = size_word // 4
+    return(int(('0' * nibbles + 'f' * nibbles) * lanes, 16))
+
+def pack(words, size_word):
+    "Pack the words in one integer, the first word in the lowest lane."
+    nibbles = size_word // 2
+    text = ''.join(['%0*x' % (nibbles, word) for word in reversed(words)])
+    return(int(text, 16))
+
+def unpack(packed, lanes, size_word):
+    "Unpack an integer in its words, the reverse of pack."
+    nibbles = size_word // 2
+    text = '%0*x' % (nibbles * lanes, packed)
+    words = [int(text[index:index + nibbles], 16)
+             for index in range(0, len(text), nibbles)]
+    words.reverse()
+    return(words)
+
+
+def _compress_lanes(algorithm, blocks, padded):
+    # Compress the padded messages, which all have the same number of blocks,
+    # together and return their hash values.
+    lanes = len(padded)
+    size_word = algorithm.SIZE_WORD
+    mask = lane_mask(lanes, size_word)
+    ones = pack([1] * lanes, size_word)
+    constants = [algorithm.constants[index] * ones
+                 for index in sorted(algorithm.constants)]
+    hash_value = tuple(word * ones for word in algorithm.initial())
+
+    # 5.2 Parsing the Padded Message, all words of every message.
+    if size_word == 32:
+        message_format = '>%sI' % (blocks * 16)
+    else:
+        message_format = '>%sQ' % (blocks * 16)
+    words = [struct.unpack(message_format, message) for message in padded]
+
+    for block in range(blocks):
+        block_words = [pack([lane[index] for lane in words], size_word)
+                       for index in range(block * 16, block * 16 + 16)]
+        hash_value = algorithm.compress(hash_value, block_words, mask,
+                                        constants)
+
+    lanes_words = [unpack(word, lanes, size_word) for word in hash_value]
+    return(zip(*lanes_words))
+
+
+def computation(messages, digest_size=256, lanes=LANES):
+    """Return the hash value of every message, in the same order, computed
+    per lanes messages at once. The hash values are tuples of integer words
+    as used by the fast engine."""
+    algorithm = DIGESTS[digest_size]
+    hash_values = [None] * len(messages)
+    groups = group(messages, algorithm.SIZE_BLOCK)
+    for blocks, members in groups.items():
+        for start in range(0, len(members), lanes):
+            part = members[start:start + lanes]
+            padded = [message for _, message in part]
+            results = _compress_lanes(algorithm, blocks, padded)
+            for (index, _), hash_value in zip(part, results):
+                hash_values[index] = hash_value
+
+    return(hash_values)
+
@@ -0,0 +1,135 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# ============================================================================
+# Copyright (c) Martin P. Hellwig <martin.hellwig@gmail.com> 14 Mar 2013
+# All rights reserved.
+# ============================================================================
+#
+# HMAC: Keyed-Hashing for Message Authentication (RFC 2104) with SHA:
+#   H(K XOR opad, H(K XOR ipad, text))
+#
+# The first block hashed by the inner and by the outer hash is always the key
+# xor'ed with ipad or opad. So for a key both of these blocks are compressed
+# once, into two SHA objects (the midstates), which are then only copied:
+# every MAC only compresses the blocks of its text and the single final block
+# of the outer hash.
+#
+# The midstates of the keys used last can be kept in a Midstates cache, given
+# to every HMAC object which should use it, so that signing with a few keys
+# over and over does not compress their key blocks every time. There is no
+# cache by default, as it holds on to the keys.
+""" """
+import binascii
+import threading
+
+from cache import LRU
+from fips_pub_180_4 import SHA, algorithm
+from fips_pub_180_4._functions import view
+
+MIDSTATE_ENTRIES = 64
+
+# RFC 2104 - 2. Definition of HMAC, every byte of the key xor'ed with ipad or
+# opad, as translation tables.
+_IPAD = ''.join([chr(byte ^ 0x36) for byte in range(256)])
+_OPAD = ''.join([chr(byte ^ 0x5c) for byte in range(256)])
+
+def _key_block(key, digest_size, engine):
+    # Return the key as one block, keys longer than a block are first hashed
+    # and shorter keys are filled with zeros.
+    size_block = algorithm(digest_size, engine).SIZE_BLOCK // 8 # in bytes
+    if len(key) > size_block:
+        sha = SHA(digest_size, engine)
+        sha.update(key)
+        key = sha.digest()
+    return(key + '\x00' * (size_block - len(key)))
+
+
+def _midstates(key, digest_size, engine):
+    # Return the inner and the outer SHA objects, which have hashed the key
+    # xor'ed with ipad and opad. These are never updated, only copied.
+    key = _key_block(key, digest_size, engine)
+    inner = SHA(digest_size, engine)
+    inner.update(key.translate(_IPAD))
+    outer = SHA(digest_size, engine)
+    outer.update(key.translate(_OPAD))
+    return(inner, outer)
+
+
+class Midstates(object):
+    """Cache of the inner and outer midstates of keys, at most entries of
+    them, the least recently used are dropped. It is safe to share between
+    threads. Note that it holds on to the keys."""
+    def __init__(self, entries=MIDSTATE_ENTRIES):
+        self.entries = entries
+        self._midstates = LRU()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return(len(self._midstates))
+
+    def get(self, key, digest_size=256, engine='fast'):
+        "Return the inner and outer midstates of key."
+        index = (key, digest_size, engine)
+        with self._lock:
+            midstates = self._midstates.get(index)
+        if midstates is not None:
+            return(midstates)
+
+        midstates = _midstates(key, digest_size, engine)
+        with self._lock:
+            self._midstates.put(index, midstates)
+            while len(self._midstates) > self.entries:
+                self._midstates.pop()
+        return(midstates)
+
+    def clear(self):
+        "Drop all the midstates."
+        with self._lock:
+            self._midstates.clear()
+
+
+class HMAC(object):
+    """HMAC (RFC 2104) of SHA with digest_size and engine, as for SHA, keyed
+    with key. The message, if given, is the first update. The midstates of
+    the key are taken from midstates, a Midstates cache which may be shared
+    by several HMAC objects, by default they are computed for this object
+    only."""
+    def __init__(self, key, digest_size=256, engine='fast', message=None,
+                 midstates=None):
+        key = view(key).tobytes()
+        if midstates is None:
+            inner, outer = _midstates(key, digest_size, engine)
+        else:
+            inner, outer = midstates.get(key, digest_size, engine)
+        self._midstates = (inner, outer)
+        self._inner = inner.copy()
+        self._outer = outer
+        if message is not None:
+            self.update(message)
+
+    def update(self, message):
+        self._inner.update(message)
+
+    def copy(self):
+        """Return a copy of this object, which can be updated independently.
+        The message given so far is not hashed again."""
+        other = self.__class__.__new__(self.__class__)
+        other._midstates = self._midstates
+        other._inner = self._inner.copy()
+        other._outer = self._outer
+        return(other)
+
+    def midstates(self):
+        """Return copies of the inner and the outer SHA objects which have
+        hashed only the key block, xor'ed with ipad and opad."""
+        inner, outer = self._midstates
+        return(inner.copy(), outer.copy())
+
+    def digest(self):
+        outer = self._outer.copy()
+        outer.update(self._inner.digest())
+        return(outer.digest())
+
+    def hexdigest(self):
+        return(binascii.hexlify(self.digest()))
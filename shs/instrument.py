@@ -0,0 +1,156 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# ============================================================================
+# Copyright (c) Martin P. Hellwig <martin.hellwig@gmail.com> 14 Mar 2013
+# All rights reserved.
+# ============================================================================
+#
+# Instrumentation of the hash computation, counting the Bits operations and
+# timing the stages of the computation.
+#
+# Nothing in the hash computation itself knows about this, attach() replaces
+# the Bits methods and the stage functions, in every module that refers to
+# them, with wrappers which report to the collector; detach() puts the
+# originals back, also in the modules imported while attached. So when no
+# collector is attached the computation is exactly as without this module and
+# costs nothing extra.
+#
+# Counts (Bits, thus only of the reference engine):
+#   bits.allocations, bits.and, bits.or, bits.xor, bits.invert, bits.add and
+#   bits.int
+# Times (in seconds, of the reference and the fast engine):
+#   padding, parsing, schedule, rounds and intermediate (the final addition
+#   of Step 4)
+# The generated engine compresses a block in a single function, so of it only
+# padding and parsing are timed.
+# The reference engine computes the message schedule from word 16 on when the
+# rounds ask for it, so that part of the schedule is timed with the rounds.
+""" """
+import sys
+import timeit
+
+from fips_pub_180_4 import _binary, _functions, _fast, _sha_2
+from fips_pub_180_4 import _sha_1, _sha_224, _sha_256, _sha_384, _sha_512
+from fips_pub_180_4 import _sha_512_224, _sha_512_256
+
+BITS_COUNTS = {'__init__':'bits.allocations',
+               '__and__':'bits.and',
+               '__or__':'bits.or',
+               '__xor__':'bits.xor',
+               '__invert__':'bits.invert',
+               '__add__':'bits.add',
+               '__int__':'bits.int'}
+
+# (function, name of the time), parse is a generator.
+STAGES = [(_functions.pad, 'padding'),
+          (_functions.parse, 'parsing'),
+          (_fast.schedule_1, 'schedule'),
+          (_fast.rounds_1, 'rounds'),
+          (_fast.intermediate, 'intermediate')]
+for _module in [_sha_1, _sha_224, _sha_256, _sha_384, _sha_512, _sha_512_224,
+                _sha_512_256]:
+    STAGES.append((_module.schedule, 'schedule'))
+    STAGES.append((_module.rounds, 'rounds'))
+    STAGES.append((_module.intermediate, 'intermediate'))
+GENERATORS = [_functions.parse]
+# (attribute, name of the time), of every family of the SHA-2 fast engine.
+FAMILY_STAGES = [('schedule', 'schedule'),
+                 ('rounds', 'rounds'),
+                 ('intermediate', 'intermediate')]
+
+_SWAPPED = list() # (object, attribute, original) of what attach replaced
+_REPLACED = list() # (replacement, original) of the stage functions
+
+class Collector(object):
+    """Collects the counts and times reported while attached, in the
+    dictionaries counts and times. Any object with the methods count and time
+    can be attached instead, for example to feed another metrics system."""
+    def __init__(self):
+        self.counts = dict()
+        self.times = dict()
+
+    def count(self, name):
+        self.counts[name] = self.counts.get(name, 0) + 1
+
+    def time(self, name, seconds):
+        self.times[name] = self.times.get(name, 0.0) + seconds
+
+
+def _counted(collector, name, function):
+    # Wrapper of function counting every call.
+    def wrapper(*arguments, **keywords):
+        collector.count(name)
+        return(function(*arguments, **keywords))
+    return(wrapper)
+
+
+def _timed(collector, name, function):
+    # Wrapper of function timing every call.
+    def wrapper(*arguments, **keywords):
+        start = timeit.default_timer()
+        try:
+            return(function(*arguments, **keywords))
+        finally:
+            collector.time(name, timeit.default_timer() - start)
+    return(wrapper)
+
+
+def _timed_generator(collector, name, function):
+    # Wrapper of a generator function timing every item generated.
+    def wrapper(*arguments, **keywords):
+        generator = function(*arguments, **keywords)
+        while True:
+            start = timeit.default_timer()
+            try:
+                item = next(generator)
+            except StopIteration:
+                collector.time(name, timeit.default_timer() - start)
+                return
+            collector.time(name, timeit.default_timer() - start)
+            yield(item)
+    return(wrapper)
+
+
+def _swap(original, replacement):
+    # Replace original by replacement in every module which refers to it.
+    for module in list(sys.modules.values()):
+        if module is None:
+            continue
+        for attribute, value in list(vars(module).items()):
+            if value is original:
+                setattr(module, attribute, replacement)
+
+
+def attach(collector):
+    "Report to collector, replaces the collector attached before if any."
+    detach()
+    for method, name in BITS_COUNTS.items():
+        original = _binary.Bits.__dict__[method]
+        setattr(_binary.Bits, method, _counted(collector, name, original))
+        _SWAPPED.append((_binary.Bits, method, original))
+
+    for function, name in STAGES:
+        if function in GENERATORS:
+            replacement = _timed_generator(collector, name, function)
+        else:
+            replacement = _timed(collector, name, function)
+        _swap(function, replacement)
+        _REPLACED.append((replacement, function))
+
+    for family in _sha_2.FAMILIES.values():
+        for attribute, name in FAMILY_STAGES:
+            original = getattr(family, attribute)
+            setattr(family, attribute, _timed(collector, name, original))
+            _SWAPPED.append((family, attribute, original))
+
+
+def detach():
+    "Stop reporting, restoring the original methods and functions."
+    while len(_SWAPPED) > 0:
+        instance, attribute, original = _SWAPPED.pop()
+        setattr(instance, attribute, original)
+    # By module, as modules imported since attach refer to the wrappers too.
+    while len(_REPLACED) > 0:
+        replacement, original = _REPLACED.pop()
+        _swap(replacement, original)
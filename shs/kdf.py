@@ -0,0 +1,138 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# ============================================================================
+# Copyright (c) Martin P. Hellwig <martin.hellwig@gmail.com> 14 Mar 2013
+# All rights reserved.
+# ============================================================================
+#
+# PBKDF2 (RFC 2898 - 5.2) with HMAC of SHA as the pseudorandom function:
+#   T_i = U_1 ^ U_2 ^ ... ^ U_c
+#   U_1 = PRF(P, S || INT(i)), U_j = PRF(P, U_{j-1})
+#
+# Every U_j after the first is HMAC of the previous U, which always has the
+# length of the digest. So the inner and the outer hash of every iteration
+# are both exactly one block: the midstate of the key (see hmac) compressed
+# with U followed by padding which is the same for every iteration. These
+# are compressed directly on the words of the engine, without SHA objects,
+# padding or parsing, which requires an engine working on integers.
+#
+# The blocks T_i do not depend on each other, so when more than one is needed
+# they are computed in parallel by worker processes.
+""" """
+import struct
+
+import fips_pub_180_4
+from fips_pub_180_4._functions import pad, view, FORMAT_BLOCK, FORMAT_WORDS
+from hmac import HMAC
+
+NAMES = {'sha1':160,
+         'sha224':224,
+         'sha256':256,
+         'sha384':384,
+         'sha512':512,
+         'sha512_224':'512:224',
+         'sha512_256':'512:256'}
+ENGINES = ['fast', 'generated']
+
+def _block(arguments):
+    # Worker function, returns T_i.
+    password, salt, iterations, index, digest_size, engine = arguments
+    algorithm = fips_pub_180_4.algorithm(digest_size, engine)
+    compress = algorithm.compress
+    size_word = algorithm.SIZE_WORD
+    size_digest = algorithm.SIZE_DIGEST // 8 # in bytes
+
+    # The key is compressed once, for U_1 and the hash values of the rest.
+    inner, outer = HMAC(password, digest_size, engine).midstates()
+    inner_value = inner.midstate()
+    outer_value = outer.midstate()
+
+    # U_1, the only one of which the message length differs per block.
+    inner.update(salt + struct.pack('>I', index))
+    outer.update(inner.digest())
+    digest = outer.digest()
+
+    # The words of a digest followed by its padding, as a block which follows
+    # the key block. The digest is the first count words, the last of which
+    # is only partly the digest for SHA-512/224.
+    length = (algorithm.SIZE_BLOCK // 8 + size_digest) * 8
+    padding = struct.unpack(FORMAT_BLOCK[size_word],
+                            pad('\x00' * size_digest, algorithm.SIZE_BLOCK,
+                                length))
+    count = -(-size_digest * 8 // size_word)
+    last = count - 1
+    last_mask = ((1 << size_word) - 1) ^ ((1 << (count * size_word -
+                                                 size_digest * 8)) - 1)
+    following = padding[count:]
+
+    words = struct.unpack(FORMAT_BLOCK[size_word],
+                          pad(digest, algorithm.SIZE_BLOCK, length))
+    result = list(words[:count])
+    for _ in range(iterations - 1):
+        hash_value = compress(inner_value, words)
+        words = (hash_value[:last] +
+                 ((hash_value[last] & last_mask) | padding[last],) +
+                 following)
+        hash_value = compress(outer_value, words)
+        words = (hash_value[:last] +
+                 ((hash_value[last] & last_mask) | padding[last],) +
+                 following)
+        result = [word ^ value for word, value in zip(result, hash_value)]
+
+    packed = struct.pack(FORMAT_WORDS[size_word] % count, *result)
+    return(packed[:size_digest])
+
+
+def _blocks(arguments, workers):
+    # The worker results in order, the pool lives as long as it takes.
+    # Imported here, loading multiprocessing takes longer than all of shs.
+    import multiprocessing
+    pool = multiprocessing.Pool(workers)
+    try:
+        results = pool.map(_block, arguments)
+        pool.close()
+        pool.join()
+    finally:
+        pool.terminate()
+    return(results)
+
+
+def pbkdf2_hmac(name, password, salt, iterations, dklen=None, engine='fast',
+                workers=None):
+    """Return the key derived from password and salt with PBKDF2 using HMAC
+    of the hash name ('sha1', 'sha224', 'sha256', 'sha384', 'sha512',
+    'sha512_224' or 'sha512_256'), as hashlib.pbkdf2_hmac does. The key is
+    dklen bytes, by default the digest size. The engine is 'fast' or
+    'generated', as for SHA. When the key takes more than one digest, these
+    are computed by a pool of worker processes, by default as many as there
+    are CPU's, unless workers is 1."""
+    if name not in NAMES:
+        text = "Name '%s' not allowed must be in: %s"
+        raise(ValueError(text % (name, sorted(NAMES))))
+    if engine not in ENGINES:
+        text = "Engine '%s' not allowed must be in: %s"
+        raise(ValueError(text % (engine, ENGINES)))
+    if iterations < 1:
+        text = "Iterations '%s' not allowed must be at least 1"
+        raise(ValueError(text % iterations))
+
+    digest_size = NAMES[name]
+    algorithm = fips_pub_180_4.algorithm(digest_size, engine)
+    size_digest = algorithm.SIZE_DIGEST // 8 # in bytes
+    if dklen is None:
+        dklen = size_digest
+    if dklen < 1:
+        text = "Dklen '%s' not allowed must be at least 1"
+        raise(ValueError(text % dklen))
+
+    password = view(password).tobytes()
+    salt = view(salt).tobytes()
+    blocks = -(-dklen // size_digest)
+    arguments = [(password, salt, iterations, index, digest_size, engine)
+                 for index in range(1, blocks + 1)]
+    if blocks > 1 and workers != 1:
+        results = _blocks(arguments, workers)
+    else:
+        results = [_block(argument) for argument in arguments]
+    return(''.join(results)[:dklen])
@@ -0,0 +1,70 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# ============================================================================
+# Copyright (c) Martin P. Hellwig <martin.hellwig@gmail.com> 14 Mar 2013
+# All rights reserved.
+# ============================================================================
+#
+# Hashing of large in memory payloads by worker processes. Passing every
+# payload to a worker would pickle and copy it, which costs about as much as
+# hashing it. Instead all payloads are copied once into one shared memory
+# array, which the workers inherit when the pool is created. A worker is then
+# only given the offsets of a payload, hashes it through a memoryview of the
+# shared array, so without copying it, and only returns the digest.
+""" """
+from fips_pub_180_4 import SHA
+from fips_pub_180_4._functions import view
+
+_SHARED = None # The shared memory array, as inherited by a worker
+
+def _initialise(shared):
+    # Worker initialiser.
+    global _SHARED
+    _SHARED = shared
+
+
+def _hash_payload(arguments):
+    # Worker function, returns the index with the hex digest of the payload.
+    index, start, end, digest_size, engine = arguments
+    sha = SHA(digest_size, engine)
+    sha.update(memoryview(_SHARED)[start:end])
+    return(index, sha.hexdigest())
+
+
+def hash_payloads(payloads, digest_size=256, workers=None, engine='fast'):
+    """Hash the payloads, a list of bytestrings or objects supporting the
+    buffer interface, with a pool of worker processes, by default as many as
+    there are CPU's. Returns the hex digests in the order of payloads.
+    Digest_size and engine are as for SHA."""
+    # Fail here on an invalid digest size or engine, not in the workers.
+    SHA(digest_size, engine)
+
+    # Copy the payloads into the shared memory, noting where each one is.
+    payloads = [view(payload) for payload in payloads]
+    total = sum([len(payload) for payload in payloads])
+    # Imported here, loading multiprocessing and ctypes takes longer than all
+    # of shs.
+    import multiprocessing
+    from multiprocessing.sharedctypes import RawArray
+    shared = RawArray('c', max(total, 1))
+    memory = memoryview(shared)
+    arguments = list()
+    start = 0
+    for index, payload in enumerate(payloads):
+        end = start + len(payload)
+        memory[start:end] = payload
+        arguments.append((index, start, end, digest_size, engine))
+        start = end
+
+    digests = [None] * len(payloads)
+    pool = multiprocessing.Pool(workers, _initialise, (shared,))
+    try:
+        for index, digest in pool.imap_unordered(_hash_payload, arguments):
+            digests[index] = digest
+        pool.close()
+        pool.join()
+    finally:
+        pool.terminate()
+
+    return(digests)
@@ -0,0 +1,103 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# ============================================================================
+# Copyright (c) Martin P. Hellwig <martin.hellwig@gmail.com> 14 Mar 2013
+# All rights reserved.
+# ============================================================================
+#
+# Batch hashing gives the same digests as hashlib, for messages of lengths
+# around the padding boundaries, hashed in groups of one or of many blocks and
+# with any number of lanes.
+""" """
+import hashlib
+import unittest
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+from shs.batch import sha1_many, sha256_many, sha512_many
+from shs.fips_pub_180_4 import _swar
+from shs.tests.test_engines import LENGTHS, message
+
+FUNCTIONS = [(160, sha1_many, hashlib.sha1),
+             (256, sha256_many, hashlib.sha256),
+             (512, sha512_many, hashlib.sha512)]
+
+def messages(lengths):
+    "Return a message of every length, which differ for the same length."
+    return([chr(index % 256) + message(length)[1:] if length else ''
+            for index, length in enumerate(lengths)])
+
+
+def hexdigest(hash_value, size_word):
+    "Return the hex digest of a hash value of integer words."
+    return(''.join(['%0*x' % (size_word // 4, word) for word in hash_value]))
+
+
+class TestSwar(unittest.TestCase):
+    def test_lengths(self):
+        # Every length once, so small groups of the lengths with as many
+        # blocks.
+        data = messages(LENGTHS)
+        for _, function, expected in FUNCTIONS:
+            self.assertEqual(function(data, 'swar'),
+                             [expected(item).hexdigest() for item in data])
+
+    def test_groups(self):
+        # Every length several times, interleaved, so groups of many lanes
+        # which all have the same number of blocks.
+        data = messages(LENGTHS * 5)
+        for _, function, expected in FUNCTIONS:
+            self.assertEqual(function(data, 'swar'),
+                             [expected(item).hexdigest() for item in data])
+
+    def test_lanes(self):
+        # More messages than lanes, so several parts per group.
+        data = messages(LENGTHS * 7)
+        for digest_size, _, expected in FUNCTIONS:
+            hexdigests = [expected(item).hexdigest() for item in data]
+            size_word = {160:32, 256:32, 512:64}[digest_size]
+            for lanes in [1, 3, 16, 256]:
+                hash_values = _swar.computation(data, digest_size, lanes)
+                self.assertEqual([hexdigest(hash_value, size_word)
+                                  for hash_value in hash_values], hexdigests)
+
+    def test_pack(self):
+        for size_word in [32, 64]:
+            largest = (1 << size_word) - 1
+            words = [0, largest, 1, largest - 1, 0x5a5a5a5a]
+            packed = _swar.pack(words, size_word)
+            self.assertEqual(_swar.unpack(packed, len(words), size_word),
+                             words)
+            # Every lane has a word, and as many guard bits above it.
+            self.assertEqual(packed & _swar.lane_mask(len(words), size_word),
+                             packed)
+
+    def test_engine(self):
+        self.assertRaises(ValueError, sha256_many, ['abc'], 'simd')
+
+
+@unittest.skipIf(numpy is None, 'numpy is not installed')
+class TestNumpy(unittest.TestCase):
+    def test_lengths(self):
+        data = messages(LENGTHS)
+        for _, function, expected in FUNCTIONS:
+            self.assertEqual(function(data, 'numpy'),
+                             [expected(item).hexdigest() for item in data])
+
+    def test_groups(self):
+        data = messages(LENGTHS * 5)
+        for _, function, expected in FUNCTIONS:
+            self.assertEqual(function(data, 'numpy'),
+                             [expected(item).hexdigest() for item in data])
+
+    def test_swar(self):
+        # Both engines give the same, which the default is.
+        data = messages(LENGTHS * 3)
+        for _, function, _ in FUNCTIONS:
+            self.assertEqual(function(data), function(data, 'swar'))
+
+if __name__ == '__main__':
+    unittest.main()
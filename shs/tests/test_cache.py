@@ -0,0 +1,34 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# ============================================================================
+# Copyright (c) Martin P. Hellwig <martin.hellwig@gmail.com> 14 Mar 2013
+# All rights reserved.
+# ============================================================================
+#
+# DigestCache gives the digests of SHA and keeps within its bounds.
+""" """
+import hashlib
+import unittest
+
+from shs.cache import DigestCache
+
+class TestDigestCache(unittest.TestCase):
+    def test_digests(self):
+        cache = DigestCache(entries=2, threshold=10)
+        for message in ['a', 'b', 'a', 'c', 'b', 'x' * 11]:
+            self.assertEqual(cache.hexdigest(message),
+                             hashlib.sha256(message).hexdigest())
+        self.assertEqual(cache.statistics(), {'hits':1, 'misses':4,
+                                              'skips':1, 'entries':2,
+                                              'bytes':2})
+
+    def test_size(self):
+        cache = DigestCache(size=5)
+        for message in ['abc', 'def', 'g']:
+            cache.digest(message)
+        # 'abc' is dropped to keep the messages within 5 bytes.
+        self.assertEqual(len(cache), 2)
+        self.assertEqual(cache.statistics()['bytes'], 4)
+        cache.clear()
+        self.assertEqual(len(cache), 0)
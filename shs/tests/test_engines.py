@@ -0,0 +1,107 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# ============================================================================
+# Copyright (c) Martin P. Hellwig <martin.hellwig@gmail.com> 14 Mar 2013
+# All rights reserved.
+# ============================================================================
+#
+# Every engine must give the same digest as the reference engine, for every
+# digest size, and the same as hashlib where it has the algorithm. The
+# message lengths are around the padding boundaries of both block sizes.
+""" """
+import hashlib
+import unittest
+
+from shs import SHA
+from shs.fips_pub_180_4 import _sha_256
+
+DIGEST_SIZES = [160, 224, 256, 384, 512, '512:224', '512:256']
+HASHLIB_NAMES = {160:'sha1', 224:'sha224', 256:'sha256', 384:'sha384',
+                 512:'sha512'}
+ENGINES = ['fast', 'generated']
+# Around the end of the first block of 64 and of 128 bytes, where the length
+# does or does not fit in the padded block.
+LENGTHS = [0, 1, 55, 56, 63, 64, 65, 111, 112, 127, 128, 129, 200]
+
+def message(length):
+    "Return a message of length bytes, which is not all the same byte."
+    return(''.join([chr((index * 7 + 3) % 256) for index in range(length)]))
+
+
+def hexdigest(digest_size, engine, chunks):
+    "Return the hex digest of the chunks given to update one by one."
+    sha = SHA(digest_size, engine)
+    for chunk in chunks:
+        sha.update(chunk)
+    return(sha.hexdigest())
+
+
+class TestEngines(unittest.TestCase):
+    def test_known(self):
+        # FIPS 180-4 examples of 'abc' for the sizes hashlib may not have.
+        known = {'512:224':'4634270f707b6a54daae7530460842e2'
+                           '0e37ed265ceee9a43e8924aa',
+                 '512:256':'53048e2681941ef99b2e29b76b4c7dab'
+                           'e4c2d0c634fc6d46e0e2f13107e7af23'}
+        for digest_size, expected in known.items():
+            for engine in ['reference'] + ENGINES:
+                self.assertEqual(hexdigest(digest_size, engine, ['abc']),
+                                 expected)
+
+    def test_identical(self):
+        for digest_size in DIGEST_SIZES:
+            for length in LENGTHS:
+                data = message(length)
+                expected = hexdigest(digest_size, 'reference', [data])
+                for engine in ENGINES:
+                    self.assertEqual(hexdigest(digest_size, engine, [data]),
+                                     expected, (digest_size, engine, length))
+                if digest_size in HASHLIB_NAMES:
+                    name = HASHLIB_NAMES[digest_size]
+                    self.assertEqual(hashlib.new(name, data).hexdigest(),
+                                     expected, (digest_size, length))
+
+    def test_chunked(self):
+        data = message(300)
+        for digest_size in DIGEST_SIZES:
+            expected = hexdigest(digest_size, 'fast', [data])
+            for engine in ['reference'] + ENGINES:
+                for size in [1, 7, 64, 100]:
+                    chunks = [data[index:index + size]
+                              for index in range(0, len(data), size)]
+                    self.assertEqual(hexdigest(digest_size, engine, chunks),
+                                     expected, (digest_size, engine, size))
+
+    def test_copy(self):
+        data = message(200)
+        for digest_size in DIGEST_SIZES:
+            for engine in ENGINES:
+                sha = SHA(digest_size, engine)
+                sha.update(data[:70])
+                other = sha.copy()
+                other.update(data[70:])
+                self.assertEqual(sha.hexdigest(),
+                                 hexdigest(digest_size, engine, [data[:70]]))
+                self.assertEqual(other.hexdigest(),
+                                 hexdigest(digest_size, engine, [data]))
+
+    def test_digest_after_update(self):
+        # The digest is kept until the next update.
+        sha = SHA(256, 'fast')
+        sha.update('ab')
+        self.assertEqual(sha.digest(), hashlib.sha256('ab').digest())
+        sha.update('c')
+        self.assertEqual(sha.digest(), hashlib.sha256('abc').digest())
+
+    def test_message_schedule(self):
+        # The words are computed on demand, so only the next one can be had.
+        message_schedule = _sha_256.schedule(range(16))
+        for index in range(17):
+            message_schedule[index]
+        self.assertRaises(IndexError, message_schedule.__getitem__, 16)
+        self.assertRaises(IndexError, message_schedule.__getitem__, 18)
+        message_schedule[17]
+
+if __name__ == '__main__':
+    unittest.main()
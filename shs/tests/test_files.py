@@ -0,0 +1,55 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# ============================================================================
+# Copyright (c) Martin P. Hellwig <martin.hellwig@gmail.com> 14 Mar 2013
+# All rights reserved.
+# ============================================================================
+#
+# hash_files gives the same digests as hashlib, by worker processes.
+""" """
+import hashlib
+import os
+import shutil
+import tempfile
+import unittest
+
+from shs import hash_files
+
+# Empty, short, several blocks and several chunks of CHUNK_SIZE.
+SIZES = [0, 3, 1000, 200 * 1024]
+
+def data(size):
+    "Return size bytes, which are not all the same byte."
+    return(''.join([chr((index * 7 + 3) % 256) for index in range(size)]))
+
+
+class TestHashFiles(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.expected = dict()
+        for size in SIZES:
+            path = os.path.join(self.directory, '%s.bin' % size)
+            with open(path, 'wb') as handle:
+                handle.write(data(size))
+            self.expected[path] = hashlib.sha256(data(size)).hexdigest()
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_workers(self):
+        results = hash_files(sorted(self.expected), 256, workers=2)
+        self.assertEqual(dict(results), self.expected)
+
+    def test_digest_size(self):
+        paths = sorted(self.expected)
+        results = dict(hash_files(paths, 512, workers=2, engine='generated'))
+        for path in paths:
+            with open(path, 'rb') as handle:
+                expected = hashlib.sha512(handle.read()).hexdigest()
+            self.assertEqual(results[path], expected)
+
+    def test_invalid(self):
+        # In the calling process, not in the workers.
+        self.assertRaises(KeyError, hash_files, [], 100)
+        self.assertRaises(ValueError, hash_files, [], 256, engine='x')
@@ -0,0 +1,91 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# ============================================================================
+# Copyright (c) Martin P. Hellwig <martin.hellwig@gmail.com> 14 Mar 2013
+# All rights reserved.
+# ============================================================================
+#
+# HMAC gives the same MACs as the hmac module of the standard library, also
+# when the midstates come from a cache.
+""" """
+import hashlib
+import hmac
+import unittest
+
+from shs import SHA
+from shs.cache import LRU
+from shs.hmac import HMAC, Midstates
+
+HASHLIB = {160:hashlib.sha1,
+           224:hashlib.sha224,
+           256:hashlib.sha256,
+           384:hashlib.sha384,
+           512:hashlib.sha512}
+ENGINES = ['reference', 'fast', 'generated']
+# Keys shorter than, as long as and longer than a block of either family.
+KEYS = ['', 'key', 'k' * 64, 'k' * 128, 'k' * 200]
+MESSAGE = 'The quick brown fox jumps over the lazy dog'
+
+class TestHmac(unittest.TestCase):
+    def test_stdlib(self):
+        for digest_size, function in sorted(HASHLIB.items()):
+            for key in KEYS:
+                expected = hmac.new(key, MESSAGE, function).hexdigest()
+                for engine in ENGINES:
+                    mac = HMAC(key, digest_size, engine, MESSAGE, None)
+                    self.assertEqual(mac.hexdigest(), expected,
+                                     (digest_size, engine, len(key)))
+
+    def test_update_copy(self):
+        expected = hmac.new('key', MESSAGE, hashlib.sha256).digest()
+        mac = HMAC('key')
+        mac.update(MESSAGE[:10])
+        other = mac.copy()
+        mac.update('something else')
+        other.update(MESSAGE[10:])
+        self.assertEqual(other.digest(), expected)
+        self.assertNotEqual(mac.digest(), expected)
+
+    def test_midstate(self):
+        # The key blocks are compressed, nothing is held back.
+        inner, outer = HMAC('key').midstates()
+        for sha in [inner, outer]:
+            self.assertEqual(len(sha.midstate()), 8)
+            self.assertNotEqual(sha.midstate(), SHA(256, 'fast').midstate())
+        inner.update('a')
+        self.assertRaises(ValueError, inner.midstate)
+        # Copies, so the HMAC is not changed by updating them.
+        mac = HMAC('key', message=MESSAGE)
+        mac.midstates()[0].update('a')
+        self.assertEqual(mac.digest(),
+                         hmac.new('key', MESSAGE, hashlib.sha256).digest())
+
+    def test_midstates(self):
+        midstates = Midstates(entries=2)
+        for key in ['a', 'b', 'a', 'c']:
+            expected = hmac.new(key, MESSAGE, hashlib.sha256).hexdigest()
+            mac = HMAC(key, 256, 'fast', MESSAGE, midstates)
+            self.assertEqual(mac.hexdigest(), expected)
+        self.assertEqual(len(midstates), 2)
+        # 'b' was the least recently used.
+        self.assertFalse(('b', 256, 'fast') in midstates._midstates)
+        self.assertTrue(midstates.get('a') is midstates.get('a'))
+        midstates.clear()
+        self.assertEqual(len(midstates), 0)
+
+
+class TestLru(unittest.TestCase):
+    def test_order(self):
+        lru = LRU()
+        for key in 'abc':
+            lru.put(key, key.upper())
+        self.assertEqual(lru.get('a'), 'A')
+        self.assertEqual(lru.get('x'), None)
+        self.assertEqual(lru.pop(), ('b', 'B'))
+        lru.put('c', 'C')
+        self.assertEqual(lru.pop(), ('a', 'A'))
+        self.assertEqual(len(lru), 1)
+        self.assertTrue('c' in lru)
+        lru.clear()
+        self.assertEqual(len(lru), 0)
@@ -0,0 +1,78 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# ============================================================================
+# Copyright (c) Martin P. Hellwig <martin.hellwig@gmail.com> 14 Mar 2013
+# All rights reserved.
+# ============================================================================
+#
+# SHA.update takes any object with the buffer interface and hashes its bytes,
+# whatever the size of its items.
+""" """
+import array
+import ctypes
+import hashlib
+import mmap
+import tempfile
+import unittest
+
+from shs import SHA, hash_file
+
+DATA = ''.join([chr(index % 256) for index in range(300)])
+
+def hexdigest(*chunks):
+    "Return the hex digest of the chunks given to update one by one."
+    sha = SHA(256, 'fast')
+    for chunk in chunks:
+        sha.update(chunk)
+    return(sha.hexdigest())
+
+
+class TestInputs(unittest.TestCase):
+    def setUp(self):
+        self.expected = hashlib.sha256(DATA).hexdigest()
+
+    def test_bytes(self):
+        for data in [DATA, bytearray(DATA), memoryview(DATA), buffer(DATA)]:
+            self.assertEqual(hexdigest(data), self.expected)
+
+    def test_wide_items(self):
+        # Items of 4 bytes, in chunks of 100 and 200 bytes.
+        words = array.array('I')
+        words.fromstring(DATA)
+        self.assertEqual(hexdigest(words), self.expected)
+        shared = (ctypes.c_uint32 * 75).from_buffer_copy(DATA)
+        self.assertEqual(hexdigest(shared), self.expected)
+        first = (ctypes.c_uint32 * 25).from_buffer_copy(DATA[:100])
+        second = (ctypes.c_uint32 * 50).from_buffer_copy(DATA[100:])
+        self.assertEqual(hexdigest(memoryview(first), memoryview(second)),
+                         self.expected)
+
+    def test_mmap(self):
+        with tempfile.TemporaryFile() as handle:
+            handle.write(DATA)
+            handle.flush()
+            mapped = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+            try:
+                self.assertEqual(hexdigest(mapped), self.expected)
+            finally:
+                mapped.close()
+
+    def test_hash_file(self):
+        for data in [DATA, '']:
+            with tempfile.NamedTemporaryFile() as handle:
+                handle.write(data)
+                handle.flush()
+                self.assertEqual(hash_file(handle.name),
+                                 hashlib.sha256(data).hexdigest())
+
+    def test_unicode(self):
+        # ASCII text as hashlib does, anything else must be encoded first.
+        self.assertEqual(hexdigest(u'abc', u''),
+                         hashlib.sha256(u'abc').hexdigest())
+        sha = SHA(256, 'fast')
+        self.assertRaises(UnicodeEncodeError, sha.update, u'\xe9')
+        self.assertRaises(UnicodeEncodeError, hashlib.sha256, u'\xe9')
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,47 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# ============================================================================
+# Copyright (c) Martin P. Hellwig <martin.hellwig@gmail.com> 14 Mar 2013
+# All rights reserved.
+# ============================================================================
+#
+# Attaching a collector reports the computation to it, detaching leaves no
+# wrapper behind, not even in modules imported while attached.
+""" """
+import imp
+import sys
+import unittest
+
+from shs import SHA, instrument
+from shs.fips_pub_180_4 import _binary, _functions
+
+class TestInstrument(unittest.TestCase):
+    def tearDown(self):
+        instrument.detach()
+        sys.modules.pop('shs_tests_imported', None)
+
+    def test_collect(self):
+        collector = instrument.Collector()
+        instrument.attach(collector)
+        sha = SHA(256, 'reference')
+        sha.update('abc')
+        sha.digest()
+        instrument.detach()
+        self.assertTrue(collector.counts['bits.allocations'] > 0)
+        for name in ['padding', 'parsing', 'schedule', 'rounds',
+                     'intermediate']:
+            self.assertTrue(name in collector.times)
+
+    def test_detach(self):
+        pad = _functions.pad
+        init = _binary.Bits.__dict__['__init__']
+        instrument.attach(instrument.Collector())
+        module = imp.new_module('shs_tests_imported')
+        sys.modules[module.__name__] = module
+        exec('from shs.fips_pub_180_4._functions import pad', vars(module))
+        self.assertTrue(module.pad is not pad)
+        instrument.detach()
+        self.assertTrue(module.pad is pad)
+        self.assertTrue(_functions.pad is pad)
+        self.assertTrue(_binary.Bits.__dict__['__init__'] is init)
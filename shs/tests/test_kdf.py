@@ -0,0 +1,57 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# ============================================================================
+# Copyright (c) Martin P. Hellwig <martin.hellwig@gmail.com> 14 Mar 2013
+# All rights reserved.
+# ============================================================================
+#
+# PBKDF2-HMAC gives the same keys as hashlib.pbkdf2_hmac.
+""" """
+import hashlib
+import unittest
+
+from shs.hmac import HMAC
+from shs.kdf import pbkdf2_hmac, NAMES, ENGINES
+
+# Passwords shorter than, as long as and longer than a block.
+PASSWORDS = ['password', 'k' * 64, 'k' * 200]
+
+class TestKdf(unittest.TestCase):
+    def test_stdlib(self):
+        for name in ['sha1', 'sha224', 'sha256', 'sha384', 'sha512']:
+            for engine in ENGINES:
+                for password in PASSWORDS:
+                    expected = hashlib.pbkdf2_hmac(name, password, 'salt', 5)
+                    self.assertEqual(pbkdf2_hmac(name, password, 'salt', 5,
+                                                 engine=engine),
+                                     expected, (name, engine, password))
+
+    def test_truncated(self):
+        # The SHA-512/t hashes, which hashlib does not have, against T_1
+        # computed with HMAC objects.
+        for name in ['sha512_224', 'sha512_256']:
+            digest_size = NAMES[name]
+            for engine in ENGINES:
+                u = HMAC('password', digest_size, engine,
+                         'salt\x00\x00\x00\x01').digest()
+                expected = u
+                for _ in range(2):
+                    u = HMAC('password', digest_size, engine, u).digest()
+                    expected = ''.join([chr(ord(x) ^ ord(y))
+                                        for x, y in zip(expected, u)])
+                self.assertEqual(pbkdf2_hmac(name, 'password', 'salt', 3,
+                                             engine=engine), expected)
+
+    def test_dklen(self):
+        # More than one block, computed in the calling process.
+        expected = hashlib.pbkdf2_hmac('sha256', 'password', 'salt', 3, 70)
+        self.assertEqual(pbkdf2_hmac('sha256', 'password', 'salt', 3, 70,
+                                     workers=1), expected)
+
+    def test_invalid(self):
+        self.assertRaises(ValueError, pbkdf2_hmac, 'md5', 'p', 's', 1)
+        self.assertRaises(ValueError, pbkdf2_hmac, 'sha256', 'p', 's', 0)
+        self.assertRaises(ValueError, pbkdf2_hmac, 'sha256', 'p', 's', 1, 0)
+        self.assertRaises(ValueError, pbkdf2_hmac, 'sha256', 'p', 's', 1,
+                          engine='reference')
@@ -0,0 +1,42 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# ============================================================================
+# Copyright (c) Martin P. Hellwig <martin.hellwig@gmail.com> 14 Mar 2013
+# All rights reserved.
+# ============================================================================
+#
+# hash_payloads gives the same digests as hashlib, in the order of the
+# payloads, by worker processes.
+""" """
+import hashlib
+import unittest
+
+from shs import hash_payloads
+
+# Empty, short and several blocks.
+SIZES = [0, 3, 1000, 64 * 1024 + 1]
+
+def data(size):
+    "Return size bytes, which are not all the same byte."
+    return(''.join([chr((index * 7 + 3) % 256) for index in range(size)]))
+
+
+class TestHashPayloads(unittest.TestCase):
+    def test_workers(self):
+        payloads = [data(size) for size in SIZES]
+        expected = [hashlib.sha256(payload).hexdigest()
+                    for payload in payloads]
+        self.assertEqual(hash_payloads(payloads, 256, workers=2), expected)
+
+    def test_buffers(self):
+        payloads = [bytearray(data(size)) for size in SIZES]
+        expected = [hashlib.sha1(payload).hexdigest() for payload in payloads]
+        self.assertEqual(hash_payloads(payloads, 160, workers=2,
+                                       engine='generated'), expected)
+
+    def test_empty(self):
+        # Only empty payloads, and none at all.
+        self.assertEqual(hash_payloads(['', ''], 256, workers=2),
+                         [hashlib.sha256('').hexdigest()] * 2)
+        self.assertEqual(hash_payloads([], 256, workers=2), [])